@@ -0,0 +1,152 @@
+"""
+Chat Completion Response Cache
+Content-addressed cache for OpenAI chat completions: an in-memory LRU
+in front of an on-disk diskcache store
+"""
+
+from collections import OrderedDict
+from hashlib import blake2b
+from pathlib import Path
+
+import diskcache
+import orjson
+
+from agents._retry import create_with_retry
+from agents._token_budget import token_budget
+
+# Bump to invalidate every cached response (e.g. after a prompt rewrite)
+CACHE_VERSION = 1
+CACHE_DIR = Path("~/.cache/shareholder_catalyst").expanduser()
+CACHE_TTL = 7 * 86400
+MEMORY_CACHE_SIZE = 256
+
+_memory = OrderedDict()
+_disk = None
+
+
+def _get_disk_cache() -> diskcache.Cache:
+    global _disk
+    if _disk is None:
+        _disk = diskcache.Cache(str(CACHE_DIR))
+    return _disk
+
+
+def _cache_key(model: str, messages: list, temperature: float, extra: dict) -> str:
+    # max_tokens is adjusted at runtime by the token budget; keying on it would
+    # turn every budget tweak into a cache miss. This is safe because only
+    # completions that finished with "stop" are cached, never ones cut off by the limit
+    payload = {
+        "v": CACHE_VERSION,
+        "m": model,
+        "t": temperature,
+        "msgs": messages,
+        "x": extra
+    }
+    return blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _is_complete(finish_reason: str, content: str) -> bool:
+    """Only finished, non-empty answers are cached; truncations ("length"), refusals and filtered replies are not"""
+    return finish_reason == "stop" and bool(content)
+
+
+def _remember(key: str, response: dict):
+    _memory[key] = response
+    _memory.move_to_end(key)
+    if len(_memory) > MEMORY_CACHE_SIZE:
+        _memory.popitem(last=False)
+
+
+async def cached_chat(client, model: str, messages: list, temperature: float,
+                      max_tokens: int, budget_name: str = None, **extra) -> dict:
+    """
+    Run a chat completion, returning a cached response for identical payloads
+
+    Fresh completions are recorded against ``budget_name`` in the token budget
+    tracker. Returns the response as a plain dict (``response.model_dump()``)
+    """
+    key = _cache_key(model, messages, temperature, extra)
+
+    response = _memory.get(key)
+    if response is not None:
+        _memory.move_to_end(key)
+        return response
+
+    disk = _get_disk_cache()
+    response = disk.get(key)
+    if response is None:
+        completion = await create_with_retry(
+            client,
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **extra
+        )
+        response = completion.model_dump()
+        if budget_name:
+            token_budget.record(budget_name, response.get('usage'))
+        choice = response['choices'][0]
+        if not _is_complete(choice.get('finish_reason'), choice['message'].get('content')):
+            return response
+        disk.set(key, response, expire=CACHE_TTL)
+
+    _remember(key, response)
+    return response
+
+
+async def cached_chat_stream(client, model: str, messages: list, temperature: float,
+                             max_tokens: int, budget_name: str = None, **extra):
+    """
+    Streaming variant of cached_chat: yields content deltas as they arrive
+
+    A cache hit yields the stored content in one piece; a stream that finishes
+    with finish_reason "stop" is stored under the same key a non-streaming call would use.
+    """
+    key = _cache_key(model, messages, temperature, extra)
+
+    response = _memory.get(key) or _get_disk_cache().get(key)
+    if response is not None:
+        _remember(key, response)
+        yield response['choices'][0]['message']['content']
+        return
+
+    stream = await create_with_retry(
+        client,
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True,
+        stream_options={"include_usage": True},
+        **extra
+    )
+
+    parts = []
+    usage = None
+    finish_reason = None
+    async for chunk in stream:
+        if chunk.usage:
+            usage = chunk.usage.model_dump()
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            finish_reason = choice.finish_reason
+        delta = choice.delta.content or ""
+        if delta:
+            parts.append(delta)
+            yield delta
+
+    if budget_name:
+        token_budget.record(budget_name, usage)
+
+    content = "".join(parts)
+    if not _is_complete(finish_reason, content):
+        return
+    response = {
+        "choices": [{"message": {"role": "assistant", "content": content}, "finish_reason": finish_reason}],
+        "usage": usage
+    }
+    _get_disk_cache().set(key, response, expire=CACHE_TTL)
+    _remember(key, response)
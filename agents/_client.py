@@ -0,0 +1,35 @@
+"""
+Shared OpenAI client
+One pooled AsyncOpenAI client reused by every agent so keep-alive
+connections (and their TLS sessions) are shared across calls
+"""
+
+import asyncio
+import weakref
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import openai
+
+# httpx pools belong to the event loop they were first used on, so clients are
+# cached per running loop; a loop's clients are dropped once the loop is collected
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client(api_key: str) -> "openai.AsyncOpenAI":
+    """Return the running event loop's AsyncOpenAI client for this API key, building it on first use"""
+    loop_clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = loop_clients.get(api_key)
+    if client is None:
+        # Deferred so importing an agent does not pull in openai/httpx/pydantic
+        import httpx
+        import openai
+
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        )
+        client = openai.AsyncOpenAI(api_key=api_key, http_client=http_client)
+        loop_clients[api_key] = client
+    return client
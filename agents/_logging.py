@@ -0,0 +1,40 @@
+"""
+Agent Logging
+Agent and tool status lines go through the "agents" and "tools" loggers; a
+QueueHandler hands each record to a background QueueListener thread so
+console writes never block the event loop
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+
+_listener = None
+
+
+def setup_logging(level: int = logging.INFO, extra_loggers: tuple = ()):
+    """
+    Route the "agents" and "tools" loggers through a queue to a stderr listener thread (safe to call repeatedly)
+
+    Module test entry points pass ``extra_loggers=(__name__,)``: run with ``-m`` their
+    module-level logger is named "__main__", outside the "agents" hierarchy.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    for name in ("agents", "tools", *extra_loggers):
+        logger = logging.getLogger(name)
+        logger.addHandler(queue_handler)
+        logger.setLevel(level)
+        logger.propagate = False
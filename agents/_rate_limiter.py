@@ -0,0 +1,88 @@
+"""
+OpenAI Rate Limiter
+Token-bucket throttling on requests-per-minute and tokens-per-minute so
+portfolio-scale runs stay inside quota instead of tripping 429s
+"""
+
+import asyncio
+import os
+import time
+import weakref
+
+MAX_REQUESTS_PER_MINUTE = int(os.getenv('OPENAI_MAX_RPM', '500'))
+MAX_TOKENS_PER_MINUTE = int(os.getenv('OPENAI_MAX_TPM', '30000'))
+MAX_CONCURRENT_REQUESTS = int(os.getenv('OPENAI_MAX_CONCURRENCY', '8'))
+
+_encoding = None
+
+
+def estimate_tokens(messages: list, max_tokens: int) -> int:
+    """Prompt tokens (tiktoken) plus the completion budget reserved by max_tokens"""
+    global _encoding
+    if _encoding is None:
+        import tiktoken
+        _encoding = tiktoken.encoding_for_model("gpt-4o")
+    prompt_tokens = sum(len(_encoding.encode(m.get('content') or '')) for m in messages)
+    return prompt_tokens + max_tokens
+
+
+class RateLimiter:
+    """Two token buckets (requests and tokens) refilled continuously at the per-minute quota"""
+
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        self.max_requests = float(max_requests_per_minute)
+        self.max_tokens = float(max_tokens_per_minute)
+        self.available_requests = self.max_requests
+        self.available_tokens = self.max_tokens
+        self.last_update = time.monotonic()
+        # asyncio.Lock binds to the loop it is first used on; the buckets are
+        # process-wide but each running loop gets its own lock
+        self._locks = weakref.WeakKeyDictionary()
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.available_requests = min(self.max_requests, self.available_requests + elapsed * self.max_requests / 60)
+        self.available_tokens = min(self.max_tokens, self.available_tokens + elapsed * self.max_tokens / 60)
+
+    async def acquire(self, tokens_needed: int):
+        """Sleep until both buckets have capacity, then consume one request and tokens_needed tokens"""
+        # A request larger than the whole bucket would never fit; let it through once the bucket is full
+        tokens_needed = min(tokens_needed, self.max_tokens)
+
+        async with self._lock():
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens_needed:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens_needed
+                    return
+
+                wait = max(
+                    (1 - self.available_requests) * 60 / self.max_requests,
+                    (tokens_needed - self.available_tokens) * 60 / self.max_tokens
+                )
+                await asyncio.sleep(wait)
+
+
+# Shared by every agent so the quota is enforced process-wide
+rate_limiter = RateLimiter(MAX_REQUESTS_PER_MINUTE, MAX_TOKENS_PER_MINUTE)
+
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def request_semaphore() -> asyncio.Semaphore:
+    """Concurrency cap for the running event loop, created on first use in that loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return semaphore
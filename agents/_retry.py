@@ -0,0 +1,58 @@
+"""
+OpenAI Retry Policy
+Retries transient OpenAI failures (429, 5xx, dropped connections) with
+jittered exponential backoff, honoring Retry-After when the API sends it
+"""
+
+import functools
+
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from agents._rate_limiter import estimate_tokens, rate_limiter, request_semaphore
+
+
+# openai is imported on first use rather than when the agents are imported
+@functools.cache
+def retryable_errors() -> tuple:
+    """Transient OpenAI errors worth retrying"""
+    import openai
+    return (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+@functools.cache
+def fallback_errors() -> tuple:
+    """Errors after which agents give up and return their fallback analysis"""
+    import openai
+    # APIError is the base of every client error (bad request, permission,
+    # not found, connection, timeout), not just the retryable ones
+    return (openai.APIError,)
+
+
+_backoff = wait_random_exponential(min=1, max=60)
+
+
+def _wait_retry_after(retry_state) -> float:
+    """Use the server's Retry-After header when present, otherwise jittered backoff"""
+    error = retry_state.outcome.exception()
+    response = getattr(error, 'response', None)
+    if response is not None:
+        retry_after = response.headers.get('retry-after')
+        if retry_after:
+            try:
+                return min(float(retry_after), 60.0)
+            except ValueError:
+                pass
+    return _backoff(retry_state)
+
+
+@retry(
+    retry=retry_if_exception(lambda e: isinstance(e, retryable_errors())),
+    wait=_wait_retry_after,
+    stop=stop_after_attempt(6),
+    reraise=True
+)
+async def create_with_retry(client, **kwargs):
+    """Rate-limited chat.completions.create, retried on transient errors"""
+    async with request_semaphore():
+        await rate_limiter.acquire(estimate_tokens(kwargs['messages'], kwargs['max_tokens']))
+        return await client.chat.completions.create(**kwargs)
@@ -0,0 +1,67 @@
+"""
+Completion Token Budgets
+Tracks how many completion tokens each agent actually produces and sizes
+max_tokens to the observed P95 (+20%) instead of a fixed worst case
+"""
+
+import json
+from collections import deque
+from pathlib import Path
+from typing import Dict, Optional
+
+BUDGET_FILE = Path("~/.cache/shareholder_catalyst/token_budget.json").expanduser()
+HISTORY_SIZE = 200
+MIN_SAMPLES = 5
+MIN_BUDGET = 1024
+
+# Single-task agents ask the model to close with this line; the API stops on it
+END_INSTRUCTION = "\n\nWhen finished, output the literal line `## End` on its own line."
+STOP_SEQUENCES = ["\n## End"]
+
+
+class TokenBudgetTracker:
+    """Rolling record of completion_tokens per agent, persisted as JSON"""
+
+    def __init__(self, path=BUDGET_FILE):
+        self.path = path
+        self.samples: Dict[str, deque] = {}
+        try:
+            with open(self.path) as f:
+                for agent_name, values in json.load(f).items():
+                    self.samples[agent_name] = deque(values, maxlen=HISTORY_SIZE)
+        except (OSError, ValueError):
+            pass
+
+    def record(self, agent_name: str, usage: Optional[dict]):
+        """Store completion_tokens from a response's usage block and persist"""
+        if not usage or not usage.get('completion_tokens'):
+            return
+        # Rejected predicted-output tokens are billed as completion tokens but were never
+        # generated text; counting them would inflate the P95 budget
+        details = usage.get('completion_tokens_details') or {}
+        generated = usage['completion_tokens'] - (details.get('rejected_prediction_tokens') or 0)
+        history = self.samples.setdefault(agent_name, deque(maxlen=HISTORY_SIZE))
+        history.append(generated)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump({name: list(values) for name, values in self.samples.items()}, f)
+        except OSError:
+            pass
+
+    def p95(self, agent_name: str) -> Optional[int]:
+        """95th percentile completion length, or None until enough samples exist"""
+        history = sorted(self.samples.get(agent_name, ()))
+        if len(history) < MIN_SAMPLES:
+            return None
+        return history[min(len(history) - 1, int(len(history) * 0.95))]
+
+    def max_tokens(self, agent_name: str, ceiling: int) -> int:
+        """P95 + 20% headroom, floored at MIN_BUDGET and never above the original ceiling"""
+        p95 = self.p95(agent_name)
+        if p95 is None:
+            return ceiling
+        return min(ceiling, max(MIN_BUDGET, int(p95 * 1.2)))
+
+
+token_budget = TokenBudgetTracker()
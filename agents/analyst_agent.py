@@ -3,62 +3,23 @@ Financial Analyst Agent - OpenAI Implementation
 Uses OpenAI GPT-4 for real financial analysis
 """
 
-import openai
-import json
-from typing import Dict
+import functools
+import logging
+from typing import Dict, List, Optional
 
-class FinancialAnalystAgent:
-    """Analyzes financial performance and identifies value gaps"""
-    
-    def __init__(self, api_key: str):
-        self.client = openai.OpenAI(api_key=api_key)
-        self.model = "gpt-4o"  # Latest GPT-4 model
-    
-    def analyze(self, extracted_data: dict) -> str:
-        """
-        Run comprehensive financial analysis on extracted data
-        
-        Returns detailed markdown analysis
-        """
-        
-        print("  💰 Running financial analysis with GPT-4...")
-        
-        # Prepare data for analysis
-        financial_data = extracted_data.get('10k', {})
-        market_data = extracted_data.get('market_data', {})
-        
-        # Create analysis prompt
-        prompt = self._build_analysis_prompt(financial_data, market_data)
-        
-        try:
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt()
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,  # Lower temperature for analytical work
-                max_tokens=4096
-            )
-            
-            analysis = response.choices[0].message.content
-            print("    ✅ Financial analysis complete")
-            return analysis
-            
-        except Exception as e:
-            print(f"    ❌ Error in financial analysis: {str(e)}")
-            return self._fallback_analysis(financial_data, market_data)
-    
-    def _get_system_prompt(self) -> str:
-        """System prompt for financial analysis"""
-        return """You are an expert financial analyst specializing in activist investing.
+import orjson
+
+from agents._cache import cached_chat
+from agents._client import get_client
+from agents._retry import fallback_errors
+from agents._token_budget import END_INSTRUCTION, STOP_SEQUENCES, token_budget
+from agents.batch_runner import submit_batch, wait_for_batch
+from agents.findings import FINANCIAL_FINDINGS_FORMAT, render_financial_findings
+from agents.models import Financials, Market
+
+logger = logging.getLogger(__name__)
+
+_SYSTEM_PROMPT_FIN = """You are an expert financial analyst specializing in activist investing.
 
 Your role is to analyze company financials and identify value creation opportunities.
 
@@ -70,58 +31,32 @@ Focus on:
 5. **Hidden Value:** Undervalued assets, non-core business units
 
 Be quantitative. Cite specific numbers. Compare to industry benchmarks.
-Identify concrete red flags that activist investors can target.
+Identify concrete red flags that activist investors can target."""
+
+# Output format for the free-text (batch) path
+_MARKDOWN_INSTRUCTION_FIN = """
 
 Output in markdown with:
 - Clear section headers
 - Bold key findings
 - Bullet points for specific issues
 - Quantified value creation opportunities"""
-    
-    def _build_analysis_prompt(self, financial_data: Dict, market_data: Dict) -> str:
-        """Build analysis prompt with financial data"""
-        
-        revenue_current = financial_data.get('revenue_current', 0)
-        revenue_prior_1 = financial_data.get('revenue_prior_1', 0)
-        net_income = financial_data.get('net_income_current', 0)
-        total_assets = financial_data.get('total_assets', 0)
-        cash = financial_data.get('cash_equivalents', 0)
-        debt = financial_data.get('total_debt', 0)
-        equity = financial_data.get('shareholders_equity', 0)
-        operating_income = financial_data.get('operating_income', 0)
-        market_cap = market_data.get('market_cap', 0)
-        
-        # Calculate key ratios
-        roe = (net_income / equity * 100) if equity else 0
-        roa = (net_income / total_assets * 100) if total_assets else 0
-        debt_to_equity = (debt / equity) if equity else 0
-        cash_to_assets = (cash / total_assets * 100) if total_assets else 0
-        operating_margin = (operating_income / revenue_current * 100) if revenue_current else 0
-        revenue_growth = ((revenue_current - revenue_prior_1) / revenue_prior_1 * 100) if revenue_prior_1 else 0
-        
-        return f"""Analyze the following company financials from an activist investor perspective:
-
-**Income Statement:**
-- Revenue (Current Year): ${revenue_current:,.0f}
-- Revenue (Prior Year): ${revenue_prior_1:,.0f}
-- Revenue Growth: {revenue_growth:.1f}%
-- Operating Income: ${operating_income:,.0f}
-- Operating Margin: {operating_margin:.1f}%
-- Net Income: ${net_income:,.0f}
 
-**Balance Sheet:**
-- Total Assets: ${total_assets:,.0f}
-- Cash & Equivalents: ${cash:,.0f} ({cash_to_assets:.1f}% of assets)
-- Total Debt: ${debt:,.0f}
-- Shareholders' Equity: ${equity:,.0f}
-- Debt-to-Equity: {debt_to_equity:.2f}x
+# Output format for the json_schema path; maps the analysis task onto FinancialFindings
+_STRUCTURED_INSTRUCTION = """
 
-**Market Data:**
-- Market Capitalization: ${market_cap:,.0f}
+Respond with a single FinancialFindings JSON object:
+- summary: 2-3 sentences on the overall activist case
+- capital_efficiency: roe_pct and roic_pct as percentages (estimate ROIC from the figures given), plus an assessment
+- cash_position: cash_pct_of_assets and debt_to_equity, plus an assessment of balance sheet and shareholder return capacity
+- profitability: operating_margin_pct and revenue_growth_pct, plus an assessment against the 30-40% margin benchmark
+- red_flags: one short sentence per issue an activist could target, citing the number behind it
+- opportunities: one entry per campaign, with title, the concrete action, and value_per_share as an estimated USD uplift per share
+Keep each assessment to 2-4 sentences; markdown emphasis inside strings is fine."""
 
-**Key Ratios:**
-- Return on Equity (ROE): {roe:.1f}%
-- Return on Assets (ROA): {roa:.1f}%
+# Task instructions precede the figures so the prompt prefix is identical
+# across companies and OpenAI prompt caching can reuse it
+_ANALYSIS_TASK_FIN = """Analyze the company financials below from an activist investor perspective.
 
 **Your Analysis Task:**
 
@@ -145,13 +80,220 @@ Output in markdown with:
    - Suggest specific activist campaigns
    - Estimate dollar impact per share
 
-Format your response as a detailed markdown report with specific, actionable findings."""
+Be specific and actionable in every finding."""
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_analysis_prompt_cached(fin: Financials, market: Market, compact: bool) -> str:
+    """Format the financial analysis prompt; memoized on the (hashable) frozen inputs"""
+    return _format_analysis_prompt(fin, market, _prompt_ratios(fin), compact)
+
+
+def _prompt_ratios(fin: Financials) -> tuple:
+    """Ratios quoted in the prompt, in agents.ratios.RATIO_COLUMNS order"""
+    
+    revenue_current = fin.revenue_current
+    revenue_prior_1 = fin.revenue_prior_1
+    net_income = fin.net_income_current
+    total_assets = fin.total_assets
+    cash = fin.cash_equivalents
+    debt = fin.total_debt
+    equity = fin.shareholders_equity
+    operating_income = fin.operating_income
+    
+    return (
+        (net_income / equity * 100) if equity else 0,
+        (net_income / total_assets * 100) if total_assets else 0,
+        (debt / equity) if equity else 0,
+        (cash / total_assets * 100) if total_assets else 0,
+        (operating_income / revenue_current * 100) if revenue_current else 0,
+        ((revenue_current - revenue_prior_1) / revenue_prior_1 * 100) if revenue_prior_1 else 0
+    )
+
+
+def _format_analysis_prompt(fin: Financials, market: Market, ratios, compact: bool) -> str:
+    """Render the prompt from precomputed ratios (agents.ratios.RATIO_COLUMNS order)"""
+    return f"""{_ANALYSIS_TASK_FIN}
+
+---
+
+{_format_financial_data(fin, market, ratios, compact)}"""
+
+
+def _format_financial_data(fin: Financials, market: Market, ratios, compact: bool) -> str:
+    """The figures block of the prompt, without the task instructions"""
+    
+    revenue_current = fin.revenue_current
+    revenue_prior_1 = fin.revenue_prior_1
+    net_income = fin.net_income_current
+    total_assets = fin.total_assets
+    cash = fin.cash_equivalents
+    debt = fin.total_debt
+    equity = fin.shareholders_equity
+    operating_income = fin.operating_income
+    market_cap = market.market_cap
+    roe, roa, debt_to_equity, cash_to_assets, operating_margin, revenue_growth = ratios
+    
+    if compact:
+        # key=value pairs in scientific notation tokenize to a fraction of "$383,285,000,000"
+        return f"""Financials (USD):
+```
+rev={revenue_current:.3e} rev_prior={revenue_prior_1:.3e} op_inc={operating_income:.3e} net_inc={net_income:.3e}
+assets={total_assets:.3e} cash={cash:.3e} debt={debt:.3e} equity={equity:.3e} mcap={market_cap:.3e}
+rev_growth={revenue_growth:+.1f}% op_margin={operating_margin:.1f}% roe={roe:.1f}% roa={roa:.1f}% d/e={debt_to_equity:.2f}
+```"""
+    
+    return f"""**Income Statement:**
+- Revenue (Current Year): ${revenue_current:,.0f}
+- Revenue (Prior Year): ${revenue_prior_1:,.0f}
+- Revenue Growth: {revenue_growth:.1f}%
+- Operating Income: ${operating_income:,.0f}
+- Operating Margin: {operating_margin:.1f}%
+- Net Income: ${net_income:,.0f}
+
+**Balance Sheet:**
+- Total Assets: ${total_assets:,.0f}
+- Cash & Equivalents: ${cash:,.0f} ({cash_to_assets:.1f}% of assets)
+- Total Debt: ${debt:,.0f}
+- Shareholders' Equity: ${equity:,.0f}
+- Debt-to-Equity: {debt_to_equity:.2f}x
+
+**Market Data:**
+- Market Capitalization: ${market_cap:,.0f}
+
+**Key Ratios:**
+- Return on Equity (ROE): {roe:.1f}%
+- Return on Assets (ROA): {roa:.1f}%"""
+
+
+class FinancialAnalystAgent:
+    """Analyzes financial performance and identifies value gaps"""
+    
+    def __init__(self, api_key: str):
+        self.api_key = api_key  # the pooled client is looked up per event loop at call time
+        self.model = "gpt-4o"  # Latest GPT-4 model
+    
+    @property
+    def max_tokens(self) -> int:
+        """Completion budget, re-read per call so new usage samples apply in a long-running app"""
+        return token_budget.max_tokens("financial", ceiling=4096)
+    
+    async def analyze(self, extracted_data: dict) -> str:
+        """
+        Run comprehensive financial analysis on extracted data
+        
+        Returns detailed markdown analysis
+        """
+        
+        findings = await self.analyze_structured(extracted_data)
+        return self.to_markdown(findings, extracted_data)
+    
+    async def analyze_structured(self, extracted_data: dict) -> Optional[Dict]:
+        """
+        Run financial analysis as a structured (json_schema) request
+        
+        Returns a FinancialFindings dict (see agents.findings), or None if the API call fails
+        """
+        
+        logger.info("  💰 Running financial analysis with GPT-4...")
+        
+        # Prepare data for analysis
+        fin = Financials.from_dict(extracted_data.get('10k'))
+        market = Market.from_dict(extracted_data.get('market_data'))
+        
+        # Create analysis prompt
+        prompt = self._build_analysis_prompt(fin, market)
+        
+        try:
+            # Call OpenAI API
+            response = await cached_chat(
+                get_client(self.api_key),
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": _SYSTEM_PROMPT_FIN + _STRUCTURED_INSTRUCTION
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.3,  # Lower temperature for analytical work
+                max_tokens=self.max_tokens,
+                response_format=FINANCIAL_FINDINGS_FORMAT,
+                budget_name="financial"
+            )
+            
+            findings = orjson.loads(response['choices'][0]['message']['content'])
+            logger.info("    ✅ Financial analysis complete")
+            return findings
+            
+        except (*fallback_errors(), ValueError) as e:
+            logger.error(f"    ❌ Error in financial analysis: {str(e)}")
+            return None
+    
+    def to_markdown(self, findings: Optional[Dict], extracted_data: dict) -> str:
+        """Render findings locally as markdown, or the fallback analysis when there are none"""
+        if findings is None:
+            return self._fallback_analysis(Financials.from_dict(extracted_data.get('10k')))
+        return render_financial_findings(findings)
+    
+    async def analyze_batch(self, data_list: List[dict]) -> List[str]:
+        """
+        Run financial analysis for many companies through the OpenAI Batch API
+        
+        Intended for non-interactive runs (e.g. overnight watchlist scans);
+        results can take up to 24h. Returns one markdown analysis per input.
+        """
+        
+        from agents.ratios import compute_ratios, to_matrix  # numpy is only needed for portfolio runs
+        
+        fins = [Financials.from_dict(d.get('10k')) for d in data_list]
+        markets = [Market.from_dict(d.get('market_data')) for d in data_list]
+        
+        # One vectorized pass over the whole portfolio instead of per-company ratio math
+        ratios = compute_ratios(to_matrix(fins))
+        
+        jobs = []
+        for i, (fin, market) in enumerate(zip(fins, markets)):
+            prompt = _format_analysis_prompt(fin, market, ratios[i].tolist(), compact=True)
+            jobs.append({
+                "custom_id": f"{i}-fin",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": _SYSTEM_PROMPT_FIN + _MARKDOWN_INSTRUCTION_FIN + END_INSTRUCTION},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": 0.3,
+                    "max_tokens": self.max_tokens,
+                    "stop": STOP_SEQUENCES
+                }
+            })
+        
+        client = get_client(self.api_key)
+        batch_id = await submit_batch(client, jobs)
+        results = await wait_for_batch(client, batch_id)
+        
+        analyses = []
+        for i, fin in enumerate(fins):
+            body = results.get(f"{i}-fin")
+            if body:
+                analyses.append(body['choices'][0]['message']['content'])
+            else:
+                analyses.append(self._fallback_analysis(fin))
+        return analyses
+    
+    def _build_analysis_prompt(self, fin: Financials, market: Market, compact: bool = True) -> str:
+        """Build analysis prompt with financial data (compact=False gives the verbose form for debugging)"""
+        return _build_analysis_prompt_cached(fin, market, compact)
     
-    def _fallback_analysis(self, financial_data: Dict, market_data: Dict) -> str:
+    def _fallback_analysis(self, fin: Financials) -> str:
         """Fallback analysis if API call fails"""
         
-        revenue = financial_data.get('revenue_current', 0)
-        net_income = financial_data.get('net_income_current', 0)
+        revenue = fin.revenue_current
+        net_income = fin.net_income_current
         
         return f"""## Financial Analysis (Fallback Mode)
 
@@ -167,12 +309,15 @@ Company generated ${revenue/1e9:.1f}B in revenue with ${net_income/1e9:.1f}B in
 """
 
 
-# Test the agent
+# Test the agent (run from the repo root: python -m agents.analyst_agent)
 if __name__ == "__main__":
+    import asyncio
     import os
     from dotenv import load_dotenv
+    from agents._logging import setup_logging
     
     load_dotenv()
+    setup_logging(extra_loggers=(__name__,))
     
     # Test data
     test_data = {
@@ -196,7 +341,7 @@ if __name__ == "__main__":
     agent = FinancialAnalystAgent(api_key)
     
     # Run analysis
-    result = agent.analyze(test_data)
+    result = asyncio.run(agent.analyze(test_data))
     print("\n" + "="*70)
     print("FINANCIAL ANALYSIS RESULT:")
     print("="*70)
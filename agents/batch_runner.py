@@ -0,0 +1,81 @@
+"""
+OpenAI Batch API Runner
+Submits non-interactive portfolio scans through the Batch API
+(50% lower token pricing, separate rate-limit pool, 24h completion window)
+"""
+
+import asyncio
+import logging
+from typing import Dict, List
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+async def submit_batch(client, jobs: List[Dict]) -> str:
+    """
+    Upload chat-completion jobs as a batch
+
+    Args:
+        client: AsyncOpenAI client
+        jobs: List of {"custom_id": str, "body": {chat.completions.create kwargs}}
+
+    Returns:
+        Batch ID
+    """
+    lines = [
+        orjson.dumps({
+            "custom_id": job["custom_id"],
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": job["body"]
+        })
+        for job in jobs
+    ]
+    payload = b"\n".join(lines) + b"\n"
+
+    batch_file = await client.files.create(file=("batch.jsonl", payload), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window="24h"
+    )
+
+    logger.info(f"  📦 Submitted batch {batch.id} with {len(jobs)} request(s)")
+    return batch.id
+
+
+async def wait_for_batch(client, batch_id: str, poll_interval: float = 60.0) -> Dict[str, dict]:
+    """
+    Poll a batch until it finishes and download its results
+
+    Returns:
+        Mapping of custom_id -> chat completion response body (successful requests only)
+    """
+    while True:
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status in TERMINAL_STATUSES:
+            break
+        await asyncio.sleep(poll_interval)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.error(f"    ❌ Batch {batch_id} ended with status: {batch.status}")
+        return {}
+
+    content = await client.files.content(batch.output_file_id)
+
+    results = {}
+    for line in content.text.splitlines():
+        if not line.strip():
+            continue
+        record = orjson.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") == 200:
+            results[record["custom_id"]] = response["body"]
+
+    logger.info(f"    ✅ Batch {batch_id} complete ({len(results)} successful)")
+    return results
@@ -0,0 +1,134 @@
+"""
+Combined Analyst Agent - OpenAI Implementation
+Runs financial analysis, governance analysis and thesis synthesis in a
+single structured GPT-4 request instead of three sequential ones
+"""
+
+import logging
+from typing import Dict
+
+import orjson
+
+from agents._cache import cached_chat
+from agents._client import get_client
+from agents._retry import fallback_errors
+from agents.analyst_agent import FinancialAnalystAgent, _SYSTEM_PROMPT_FIN, _format_financial_data, _prompt_ratios
+from agents.governance_agent import GovernanceAnalystAgent, _SYSTEM_PROMPT_GOV, _format_governance_data
+from agents.models import Financials, Market, Proxy
+from agents.thesis_generator import ThesisGeneratorAgent, _SYSTEM_PROMPT_THESIS
+
+logger = logging.getLogger(__name__)
+
+_SYSTEM_PROMPT_COMBINED = f"""You perform three tasks for an activist investment fund in one response.
+Return a JSON object with the fields `financial_analysis`, `governance_analysis` and `thesis`.
+Each field is a markdown string written according to the matching role below.
+
+=== ROLE FOR financial_analysis ===
+{_SYSTEM_PROMPT_FIN}
+
+=== ROLE FOR governance_analysis ===
+{_SYSTEM_PROMPT_GOV}
+
+=== ROLE FOR thesis ===
+{_SYSTEM_PROMPT_THESIS}"""
+
+# One instruction covering every field of the response schema; the company data follows it
+_COMBINED_TASK = """Analyze the company below from an activist investor perspective and fill in each field of the response object:
+
+- financial_analysis: capital efficiency (ROE, ROIC), cash and capital structure (excess cash, leverage, room for buybacks or dividends), operating performance against a 30-40% operating margin benchmark, and value creation opportunities with an estimated dollar impact per share
+- governance_analysis: CEO pay-for-performance alignment, say-on-pay support (concern below 85%), board independence (benchmark above 80%) and tenure (red flag above 15 years), naming directors, and the compensation or board reforms to push for
+- thesis: the activist investment thesis, built on the findings you give in financial_analysis and governance_analysis
+
+Be specific with names, numbers, and dollar amounts."""
+
+_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "combined_analysis",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "financial_analysis": {"type": "string"},
+                "governance_analysis": {"type": "string"},
+                "thesis": {"type": "string"}
+            },
+            "required": ["financial_analysis", "governance_analysis", "thesis"],
+            "additionalProperties": False
+        }
+    }
+}
+
+
+class CombinedAnalystAgent:
+    """Produces financial analysis, governance analysis and thesis from one API call"""
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key  # the pooled client is looked up per event loop at call time
+        self.model = "gpt-4o"  # Latest GPT-4 model
+
+        # The single-task agents supply the prompt builders and fallbacks
+        self.financial_agent = FinancialAnalystAgent(api_key)
+        self.governance_agent = GovernanceAnalystAgent(api_key)
+        self.thesis_agent = ThesisGeneratorAgent(api_key)
+
+    async def analyze(self, extracted_data: dict, company_name: str, ticker: str) -> Dict[str, str]:
+        """
+        Run all three analyses in a single request
+
+        Returns dict with 'financial_analysis', 'governance_analysis' and 'thesis' markdown strings
+        """
+
+        logger.info("  🧠 Running combined financial/governance/thesis analysis with GPT-4...")
+
+        fin = Financials.from_dict(extracted_data.get('10k'))
+        market = Market.from_dict(extracted_data.get('market_data'))
+        proxy = Proxy.from_dict(extracted_data.get('proxy'))
+
+        prompt = self._build_combined_prompt(fin, market, proxy, extracted_data, company_name, ticker)
+
+        try:
+            response = await cached_chat(
+                get_client(self.api_key),
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": _SYSTEM_PROMPT_COMBINED
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.3,
+                max_tokens=12000,
+                response_format=_RESPONSE_FORMAT
+            )
+
+            result = orjson.loads(response['choices'][0]['message']['content'])
+            logger.info("    ✅ Combined analysis complete")
+            return result
+
+        except (*fallback_errors(), ValueError) as e:
+            logger.error(f"    ❌ Error in combined analysis: {str(e)}")
+            return {
+                'financial_analysis': self.financial_agent._fallback_analysis(fin),
+                'governance_analysis': self.governance_agent._fallback_analysis(proxy),
+                'thesis': self.thesis_agent._fallback_thesis(company_name, ticker)
+            }
+
+    def _build_combined_prompt(self, fin: Financials, market: Market, proxy: Proxy,
+                               extracted_data: dict, company_name: str, ticker: str) -> str:
+        """One task instruction followed by the company's financial and governance data"""
+
+        return f"""{_COMBINED_TASK}
+
+---
+
+**Company:** {company_name} ({ticker})
+**Current Price:** ${market.current_price:.2f}
+
+{_format_financial_data(fin, market, _prompt_ratios(fin), compact=True)}
+
+{_format_governance_data(proxy, fin, market)}"""
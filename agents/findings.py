@@ -0,0 +1,145 @@
+"""
+Structured Analyst Findings
+Strict json_schema response formats for the financial and governance agents,
+plus local renderers that turn the returned findings into markdown
+"""
+
+from typing import Dict
+
+import orjson
+
+
+def _strict_object(properties: Dict) -> Dict:
+    """Object schema in the form strict structured outputs require (every key required, no extras)"""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False
+    }
+
+
+def _response_format(name: str, schema: Dict) -> Dict:
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+
+_STRING = {"type": "string"}
+_NUMBER = {"type": "number"}
+
+FINANCIAL_FINDINGS_FORMAT = _response_format("FinancialFindings", _strict_object({
+    "summary": _STRING,
+    "capital_efficiency": _strict_object({"roe_pct": _NUMBER, "roic_pct": _NUMBER, "assessment": _STRING}),
+    "cash_position": _strict_object({"cash_pct_of_assets": _NUMBER, "debt_to_equity": _NUMBER, "assessment": _STRING}),
+    "profitability": _strict_object({"operating_margin_pct": _NUMBER, "revenue_growth_pct": _NUMBER, "assessment": _STRING}),
+    "red_flags": {"type": "array", "items": _STRING},
+    "opportunities": {"type": "array", "items": _strict_object({
+        "title": _STRING,
+        "action": _STRING,
+        "value_per_share": _NUMBER
+    })}
+}))
+
+GOVERNANCE_FINDINGS_FORMAT = _response_format("GovernanceFindings", _strict_object({
+    "summary": _STRING,
+    "compensation": _strict_object({
+        "ceo_pay_usd": _NUMBER,
+        "yoy_change_pct": _NUMBER,
+        "pay_pct_of_net_income": _NUMBER,
+        "assessment": _STRING
+    }),
+    "say_on_pay": _strict_object({"approval_pct": _NUMBER, "assessment": _STRING}),
+    "board": _strict_object({"independence_assessment": _STRING, "tenure_assessment": _STRING}),
+    "red_flags": {"type": "array", "items": _strict_object({
+        "issue": _STRING,
+        "severity": {"type": "string", "enum": ["high", "medium", "low"]},
+        "evidence": _STRING
+    })},
+    "recommendations": {"type": "array", "items": _strict_object({
+        "title": _STRING,
+        "action": _STRING,
+        "value_impact": _STRING
+    })}
+}))
+
+
+def render_financial_findings(findings: Dict) -> str:
+    """Format FinancialFindings as the markdown report shown in the UI"""
+    capital = findings['capital_efficiency']
+    cash = findings['cash_position']
+    profit = findings['profitability']
+
+    red_flags = "\n".join(f"- {flag}" for flag in findings['red_flags']) or "- None identified"
+    opportunities = "\n".join(
+        f"- **{o['title']}** (~${o['value_per_share']:.2f}/share): {o['action']}"
+        for o in findings['opportunities']
+    ) or "- None identified"
+
+    return f"""## Financial Analysis
+
+{findings['summary']}
+
+### Capital Efficiency
+**ROE {capital['roe_pct']:.1f}% | ROIC {capital['roic_pct']:.1f}%**
+
+{capital['assessment']}
+
+### Cash & Capital Structure
+**Cash {cash['cash_pct_of_assets']:.1f}% of assets | Debt-to-Equity {cash['debt_to_equity']:.2f}x**
+
+{cash['assessment']}
+
+### Operational Performance
+**Operating Margin {profit['operating_margin_pct']:.1f}% | Revenue Growth {profit['revenue_growth_pct']:+.1f}%**
+
+{profit['assessment']}
+
+### Red Flags
+{red_flags}
+
+### Value Creation Opportunities
+{opportunities}
+"""
+
+
+def render_governance_findings(findings: Dict) -> str:
+    """Format GovernanceFindings as the markdown report shown in the UI"""
+    comp = findings['compensation']
+    say_on_pay = findings['say_on_pay']
+    board = findings['board']
+
+    red_flags = "\n".join(
+        f"- **{f['issue']}** ({f['severity']}): {f['evidence']}" for f in findings['red_flags']
+    ) or "- None identified"
+    recommendations = "\n".join(
+        f"- **{r['title']}**: {r['action']} *(Impact: {r['value_impact']})*" for r in findings['recommendations']
+    ) or "- None"
+
+    return f"""## Governance Analysis
+
+{findings['summary']}
+
+### Executive Compensation
+**CEO Pay ${comp['ceo_pay_usd']/1e6:.1f}M ({comp['yoy_change_pct']:+.1f}% YoY, {comp['pay_pct_of_net_income']:.2f}% of net income)**
+
+{comp['assessment']}
+
+### Say-on-Pay
+**Approval {say_on_pay['approval_pct']:.1f}%**
+
+{say_on_pay['assessment']}
+
+### Board Composition
+- **Independence:** {board['independence_assessment']}
+- **Tenure:** {board['tenure_assessment']}
+
+### Red Flags
+{red_flags}
+
+### Recommendations
+{recommendations}
+"""
+
+
+def compact_findings(findings: Dict) -> str:
+    """Single-line JSON of the findings for embedding in the thesis prompt"""
+    return orjson.dumps(findings).decode()
@@ -3,63 +3,21 @@ Governance Analyst Agent - OpenAI Implementation
 Uses OpenAI GPT-4 for corporate governance analysis
 """
 
-import openai
-import json
-from typing import Dict
+import logging
+from typing import Dict, Optional
 
-class GovernanceAnalystAgent:
-    """Analyzes corporate governance and compensation practices"""
-    
-    def __init__(self, api_key: str):
-        self.client = openai.OpenAI(api_key=api_key)
-        self.model = "gpt-4o"  # Latest GPT-4 model
-    
-    def analyze(self, extracted_data: dict) -> str:
-        """
-        Run comprehensive governance analysis on extracted proxy data
-        
-        Returns detailed markdown analysis of governance issues
-        """
-        
-        print("  👔 Running governance analysis with GPT-4...")
-        
-        # Prepare data for analysis
-        proxy_data = extracted_data.get('proxy', {})
-        financial_data = extracted_data.get('10k', {})
-        market_data = extracted_data.get('market_data', {})
-        
-        # Create analysis prompt
-        prompt = self._build_analysis_prompt(proxy_data, financial_data, market_data)
-        
-        try:
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt()
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=4096
-            )
-            
-            analysis = response.choices[0].message.content
-            print("    ✅ Governance analysis complete")
-            return analysis
-            
-        except Exception as e:
-            print(f"    ❌ Error in governance analysis: {str(e)}")
-            return self._fallback_analysis(proxy_data)
-    
-    def _get_system_prompt(self) -> str:
-        """System prompt for governance analysis"""
-        return """You are an expert corporate governance analyst specializing in activist investing.
+import orjson
+
+from agents._cache import cached_chat
+from agents._client import get_client
+from agents._retry import fallback_errors
+from agents._token_budget import token_budget
+from agents.findings import GOVERNANCE_FINDINGS_FORMAT, render_governance_findings
+from agents.models import Financials, Market, Proxy
+
+logger = logging.getLogger(__name__)
+
+_SYSTEM_PROMPT_GOV = """You are an expert corporate governance analyst specializing in activist investing.
 
 Your role is to identify governance red flags and compensation misalignments that activist investors can target.
 
@@ -71,56 +29,10 @@ Focus on:
 5. **Say-on-Pay Results:** Shareholder approval trends
 
 Be direct and critical. Call out specific issues with names and numbers.
-Compare to best practices (e.g., majority independent boards, <10 year CEO tenure).
-
-Output in markdown with:
-- Clear section headers
-- Bold key findings and names
-- Specific governance violations or weaknesses
-- Actionable recommendations for activist campaigns"""
-    
-    def _build_analysis_prompt(self, proxy_data: Dict, financial_data: Dict, market_data: Dict) -> str:
-        """Build analysis prompt with governance data"""
-        
-        ceo_comp_current = proxy_data.get('ceo_total_comp_current', 0)
-        ceo_comp_prior = proxy_data.get('ceo_total_comp_prior_1', 0)
-        board_members = proxy_data.get('board_members', [])
-        say_on_pay = proxy_data.get('say_on_pay_approval_pct', 0)
-        
-        net_income = financial_data.get('net_income_current', 0)
-        revenue = financial_data.get('revenue_current', 0)
-        market_cap = market_data.get('market_cap', 0)
-        
-        # Calculate pay ratios
-        pay_as_pct_of_income = (ceo_comp_current / net_income * 100) if net_income else 0
-        pay_change = ((ceo_comp_current - ceo_comp_prior) / ceo_comp_prior * 100) if ceo_comp_prior else 0
-        
-        # Format board table
-        board_table = "\n".join([
-            f"  - **{m.get('name', 'Unknown')}**: {m.get('role', 'Director')}, "
-            f"{m.get('tenure_years', 0)} years, "
-            f"{'Independent' if m.get('independent') else 'Not Independent'}"
-            for m in board_members
-        ])
-        
-        return f"""Analyze the following corporate governance data from an activist investor perspective:
-
-**Executive Compensation:**
-- CEO Total Compensation (Current): ${ceo_comp_current:,.0f}
-- CEO Total Compensation (Prior Year): ${ceo_comp_prior:,.0f}
-- Year-over-Year Change: {pay_change:+.1f}%
-- CEO Pay as % of Net Income: {pay_as_pct_of_income:.2f}%
-
-**Say-on-Pay Vote:**
-- Shareholder Approval Rate: {say_on_pay:.1f}%
+Compare to best practices (e.g., majority independent boards, <10 year CEO tenure)."""
 
-**Board of Directors:**
-{board_table if board_table else "  - Board composition data not available"}
-
-**Company Performance Context:**
-- Net Income: ${net_income:,.0f}
-- Revenue: ${revenue:,.0f}
-- Market Cap: ${market_cap:,.0f}
+# Placed ahead of the per-company data in the user message
+_ANALYSIS_TASK_GOV = """Analyze the corporate governance data below from an activist investor perspective.
 
 **Your Analysis Task:**
 
@@ -148,12 +60,149 @@ Output in markdown with:
    - Estimate potential value creation from governance improvements
 
 Be specific with names, numbers, and recommendations. This is for an activist proxy fight."""
+
+# Output format for the json_schema request; maps the analysis task onto GovernanceFindings
+_STRUCTURED_INSTRUCTION = """
+
+Respond with a single GovernanceFindings JSON object:
+- summary: 2-3 sentences on the overall governance case
+- compensation: ceo_pay_usd, yoy_change_pct and pay_pct_of_net_income from the data given, plus a pay-for-performance assessment
+- say_on_pay: approval_pct, plus an assessment against the 85% concern threshold
+- board: independence_assessment and tenure_assessment, naming the directors concerned
+- red_flags: one entry per issue, with severity (high, medium or low) and the names or figures as evidence
+- recommendations: one entry per campaign action, with title, the concrete action and its value_impact for shareholders
+Keep each assessment to 2-4 sentences; markdown emphasis inside strings is fine."""
+
+# Indexed by bool(BoardMember.independent)
+_INDEPENDENCE_LABELS = ("Not Independent", "Independent")
+
+
+def _format_governance_data(proxy: Proxy, fin: Financials, market: Market) -> str:
+    """The governance figures block of the prompt, without the task instructions"""
+    
+    ceo_comp_current = proxy.ceo_total_comp_current
+    ceo_comp_prior = proxy.ceo_total_comp_prior_1
+    say_on_pay = proxy.say_on_pay_approval_pct
+    
+    net_income = fin.net_income_current
+    revenue = fin.revenue_current
+    market_cap = market.market_cap
+    
+    # Calculate pay ratios
+    pay_as_pct_of_income = (ceo_comp_current / net_income * 100) if net_income else 0
+    pay_change = ((ceo_comp_current - ceo_comp_prior) / ceo_comp_prior * 100) if ceo_comp_prior else 0
+    
+    # Format board table
+    board_table = "\n".join(
+        f"  - **{m.name}**: {m.role}, {m.tenure_years} years, {_INDEPENDENCE_LABELS[bool(m.independent)]}"
+        for m in proxy.board_members
+    )
+    
+    return f"""**Executive Compensation:**
+- CEO Total Compensation (Current): ${ceo_comp_current:,.0f}
+- CEO Total Compensation (Prior Year): ${ceo_comp_prior:,.0f}
+- Year-over-Year Change: {pay_change:+.1f}%
+- CEO Pay as % of Net Income: {pay_as_pct_of_income:.2f}%
+
+**Say-on-Pay Vote:**
+- Shareholder Approval Rate: {say_on_pay:.1f}%
+
+**Board of Directors:**
+{board_table if board_table else "  - Board composition data not available"}
+
+**Company Performance Context:**
+- Net Income: ${net_income:,.0f}
+- Revenue: ${revenue:,.0f}
+- Market Cap: ${market_cap:,.0f}"""
+
+
+class GovernanceAnalystAgent:
+    """Analyzes corporate governance and compensation practices"""
+    
+    def __init__(self, api_key: str):
+        self.api_key = api_key  # the pooled client is looked up per event loop at call time
+        self.model = "gpt-4o"  # Latest GPT-4 model
+    
+    @property
+    def max_tokens(self) -> int:
+        """Completion budget, re-read per call so new usage samples apply in a long-running app"""
+        return token_budget.max_tokens("governance", ceiling=4096)
+    
+    async def analyze(self, extracted_data: dict) -> str:
+        """
+        Run comprehensive governance analysis on extracted proxy data
+        
+        Returns detailed markdown analysis of governance issues
+        """
+        
+        findings = await self.analyze_structured(extracted_data)
+        return self.to_markdown(findings, extracted_data)
+    
+    async def analyze_structured(self, extracted_data: dict) -> Optional[Dict]:
+        """
+        Run governance analysis as a structured (json_schema) request
+        
+        Returns a GovernanceFindings dict (see agents.findings), or None if the API call fails
+        """
+        
+        logger.info("  👔 Running governance analysis with GPT-4...")
+        
+        # Prepare data for analysis
+        proxy = Proxy.from_dict(extracted_data.get('proxy'))
+        fin = Financials.from_dict(extracted_data.get('10k'))
+        market = Market.from_dict(extracted_data.get('market_data'))
+        
+        # Create analysis prompt
+        prompt = self._build_analysis_prompt(proxy, fin, market)
+        
+        try:
+            # Call OpenAI API
+            response = await cached_chat(
+                get_client(self.api_key),
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": _SYSTEM_PROMPT_GOV + _STRUCTURED_INSTRUCTION
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.3,
+                max_tokens=self.max_tokens,
+                response_format=GOVERNANCE_FINDINGS_FORMAT,
+                budget_name="governance"
+            )
+            
+            findings = orjson.loads(response['choices'][0]['message']['content'])
+            logger.info("    ✅ Governance analysis complete")
+            return findings
+            
+        except (*fallback_errors(), ValueError) as e:
+            logger.error(f"    ❌ Error in governance analysis: {str(e)}")
+            return None
+    
+    def to_markdown(self, findings: Optional[Dict], extracted_data: dict) -> str:
+        """Render findings locally as markdown, or the fallback analysis when there are none"""
+        if findings is None:
+            return self._fallback_analysis(Proxy.from_dict(extracted_data.get('proxy')))
+        return render_governance_findings(findings)
+    
+    def _build_analysis_prompt(self, proxy: Proxy, fin: Financials, market: Market) -> str:
+        """Build analysis prompt with governance data"""
+        return f"""{_ANALYSIS_TASK_GOV}
+
+---
+
+{_format_governance_data(proxy, fin, market)}"""
     
-    def _fallback_analysis(self, proxy_data: Dict) -> str:
+    def _fallback_analysis(self, proxy: Proxy) -> str:
         """Fallback analysis if API call fails"""
         
-        ceo_comp = proxy_data.get('ceo_total_comp_current', 0)
-        say_on_pay = proxy_data.get('say_on_pay_approval_pct', 0)
+        ceo_comp = proxy.ceo_total_comp_current
+        say_on_pay = proxy.say_on_pay_approval_pct
         
         return f"""## Governance Analysis (Fallback Mode)
 
@@ -170,12 +219,15 @@ Be specific with names, numbers, and recommendations. This is for an activist pr
 """
 
 
-# Test the agent
+# Test the agent (run from the repo root: python -m agents.governance_agent)
 if __name__ == "__main__":
+    import asyncio
     import os
     from dotenv import load_dotenv
+    from agents._logging import setup_logging
     
     load_dotenv()
+    setup_logging(extra_loggers=(__name__,))
     
     # Test data
     test_data = {
@@ -203,7 +255,7 @@ if __name__ == "__main__":
     agent = GovernanceAnalystAgent(api_key)
     
     # Run analysis
-    result = agent.analyze(test_data)
+    result = asyncio.run(agent.analyze(test_data))
     print("\n" + "="*70)
     print("GOVERNANCE ANALYSIS RESULT:")
     print("="*70)
@@ -0,0 +1,72 @@
+"""
+Extracted Data Models
+Typed, immutable views of the 10-K, proxy and market data dicts the
+agents consume, built once per analysis instead of per-field .get() chains
+"""
+
+from dataclasses import dataclass, fields
+from typing import Dict, Tuple
+
+
+def _known_fields(cls, data: Dict) -> Dict:
+    """Keep only keys the dataclass declares; missing or null values use the field default"""
+    names = {f.name for f in fields(cls)}
+    return {k: v for k, v in (data or {}).items() if k in names and v is not None}
+
+
+@dataclass(slots=True, frozen=True)
+class Financials:
+    """Key 10-K figures"""
+    revenue_current: float = 0.0
+    revenue_prior_1: float = 0.0
+    net_income_current: float = 0.0
+    total_assets: float = 0.0
+    cash_equivalents: float = 0.0
+    total_debt: float = 0.0
+    shareholders_equity: float = 0.0
+    operating_income: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Financials":
+        return cls(**_known_fields(cls, data))
+
+
+@dataclass(slots=True, frozen=True)
+class BoardMember:
+    """One director from the proxy statement"""
+    name: str = "Unknown"
+    role: str = "Director"
+    tenure_years: float = 0
+    independent: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BoardMember":
+        return cls(**_known_fields(cls, data))
+
+
+@dataclass(slots=True, frozen=True)
+class Proxy:
+    """Key DEF 14A governance figures"""
+    ceo_total_comp_current: float = 0.0
+    ceo_total_comp_prior_1: float = 0.0
+    say_on_pay_approval_pct: float = 0.0
+    board_members: Tuple[BoardMember, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Proxy":
+        values = _known_fields(cls, data)
+        values['board_members'] = tuple(
+            BoardMember.from_dict(m) for m in values.get('board_members', ()) if isinstance(m, dict)
+        )
+        return cls(**values)
+
+
+@dataclass(slots=True, frozen=True)
+class Market:
+    """Market data used in prompts"""
+    market_cap: float = 0.0
+    current_price: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Market":
+        return cls(**_known_fields(cls, data))
@@ -0,0 +1,55 @@
+"""
+Vectorized Ratio Math
+Computes the financial-analysis prompt ratios for a whole portfolio in a
+handful of numpy ufunc calls instead of per-company Python arithmetic
+"""
+
+from typing import List
+
+import numpy as np
+
+from agents.models import Financials
+
+# Column order of the input matrix
+INPUT_COLUMNS = (
+    'revenue_current', 'revenue_prior_1', 'net_income_current', 'total_assets',
+    'cash_equivalents', 'total_debt', 'shareholders_equity', 'operating_income'
+)
+
+# Column order of compute_ratios() output
+RATIO_COLUMNS = ('roe', 'roa', 'debt_to_equity', 'cash_to_assets', 'operating_margin', 'revenue_growth')
+
+
+def to_matrix(financials: List[Financials]) -> np.ndarray:
+    """Stack Financials rows into an (N, 8) float array in INPUT_COLUMNS order"""
+    return np.array(
+        [[getattr(fin, col) for col in INPUT_COLUMNS] for fin in financials],
+        dtype=np.float64
+    ).reshape(len(financials), len(INPUT_COLUMNS))
+
+
+def _safe_divide(num: np.ndarray, denom: np.ndarray) -> np.ndarray:
+    return np.divide(num, denom, out=np.zeros_like(num), where=denom != 0)
+
+
+def compute_ratios(arr: np.ndarray) -> np.ndarray:
+    """
+    Compute ROE, ROA, D/E, cash/assets, operating margin and revenue growth
+
+    Args:
+        arr: (N, 8) array with columns in INPUT_COLUMNS order
+
+    Returns:
+        (N, 6) array with columns in RATIO_COLUMNS order (percentages except D/E);
+        ratios with a zero denominator are 0
+    """
+    revenue, revenue_prior, net_income, total_assets, cash, debt, equity, operating_income = arr.T
+
+    return np.column_stack((
+        _safe_divide(net_income, equity) * 100,
+        _safe_divide(net_income, total_assets) * 100,
+        _safe_divide(debt, equity),
+        _safe_divide(cash, total_assets) * 100,
+        _safe_divide(operating_income, revenue) * 100,
+        _safe_divide(revenue - revenue_prior, revenue_prior) * 100
+    ))
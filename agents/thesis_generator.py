@@ -3,34 +3,164 @@ Thesis Generator Agent - OpenAI Implementation
 Uses OpenAI GPT-4 to synthesize analyses into activist investment thesis
 """
 
-import openai
-import json
-from typing import Dict
+import logging
+import re
+from typing import Dict, Union
+
+from agents._cache import cached_chat_stream
+from agents._client import get_client
+from agents._retry import fallback_errors
+from agents._token_budget import END_INSTRUCTION, STOP_SEQUENCES, token_budget
+from agents.findings import compact_findings
+from agents.models import Financials, Market
+
+logger = logging.getLogger(__name__)
+
+_SYSTEM_PROMPT_THESIS = """You are a senior analyst at an activist investment fund, preparing a comprehensive investment thesis.
+
+Your role is to synthesize financial and governance analyses into a compelling, actionable activist thesis.
+
+Structure your thesis with:
+
+# Investment Thesis: [COMPANY] ([TICKER])
+
+## Executive Summary
+2-3 paragraphs covering:
+- The opportunity (what's broken)
+- The solution (specific activist campaign)
+- The return potential (price target, timeline)
+
+## Value Creation Opportunities
+For each catalyst (3-5 total):
+### Catalyst N: [Name]
+- **Current State:** What's wrong now
+- **Proposed Action:** Specific steps (1-3 bullet points)
+- **Value Impact:** Quantified impact ($ per share or % upside)
+- **Timeline:** How long to realize
+
+## Proposed Action Plan
+### Phase 1: Engagement (Months 1-3)
+### Phase 2: Implementation (Months 3-12)
+### Phase 3: Value Realization (Months 12-24)
+
+## Valuation & Return Potential
+- Current valuation
+- Target valuation with rationale
+- Base case and bull case scenarios
+
+## Risk Factors
+3-5 key risks to the thesis
+
+## Conclusion
+Clear recommendation: Initiate position or Pass
+
+Be direct, quantitative, and action-oriented. Use bold for key findings.
+This is for LP presentation and internal investment committee."""
+
+_THESIS_TASK = """Synthesize the financial and governance analyses below into a compelling activist investment thesis.
+
+Requirements:
+1. **Executive Summary** - Make it punchy and investor-ready
+2. **Value Creation Catalysts** - Identify 3-5 specific, actionable opportunities
+3. **Action Plan** - Timeline with specific milestones
+4. **Valuation** - Target price with clear methodology
+5. **Risks** - Be honest about what could go wrong
+6. **Recommendation** - Clear buy/pass decision
+
+Focus on:
+- Specific numbers and percentages
+- Concrete actions (not vague suggestions)
+- Realistic timelines (12-24 months)
+- Quantified value creation ($ per share)
+
+This thesis will be presented to the investment committee and potentially to the company's board."""
+
+# Headings and bolded bullets carry the findings; prose paragraphs are dropped
+_KEY_LINE = re.compile(r'^(#{1,3} |- \*\*|\*\*).*$', re.M)
+
+# Appended to the stream when the API fails after tokens have already been shown
+_INTERRUPTED_NOTE = "\n\n---\n\n*⚠️ Thesis generation was interrupted by an API error; the thesis above is incomplete.*\n"
+
+# Fixed skeleton of the thesis (mirrors the structure in _SYSTEM_PROMPT_THESIS), sent as
+# an OpenAI predicted output so matching heading tokens are accepted rather than decoded
+_THESIS_TEMPLATE = """# Investment Thesis: {company_name} ({ticker})
+
+## Executive Summary
+
+## Value Creation Opportunities
+
+### Catalyst 1: 
+- **Current State:** 
+- **Proposed Action:** 
+- **Value Impact:** 
+- **Timeline:** 
+
+### Catalyst 2: 
+- **Current State:** 
+- **Proposed Action:** 
+- **Value Impact:** 
+- **Timeline:** 
+
+### Catalyst 3: 
+- **Current State:** 
+- **Proposed Action:** 
+- **Value Impact:** 
+- **Timeline:** 
+
+## Proposed Action Plan
+
+### Phase 1: Engagement (Months 1-3)
+
+### Phase 2: Implementation (Months 3-12)
+
+### Phase 3: Value Realization (Months 12-24)
+
+## Valuation & Return Potential
+
+## Risk Factors
+
+## Conclusion
+"""
+
+
+def _compact_analysis(md: str) -> str:
+    """Keep only section headers and bolded bullets of an upstream markdown analysis"""
+    key_lines = [m.group(0) for m in _KEY_LINE.finditer(md)]
+    # Text with no headers or bold bullets (e.g. a short fallback note) passes through as-is
+    return "\n".join(key_lines) if key_lines else md
+
 
 class ThesisGeneratorAgent:
     """Synthesizes analyses into activist investment thesis"""
     
     def __init__(self, api_key: str):
-        self.client = openai.OpenAI(api_key=api_key)
+        self.api_key = api_key  # the pooled client is looked up per event loop at call time
         self.model = "gpt-4o"  # Latest GPT-4 model
     
-    def generate_thesis(self, financial_analysis: str, governance_analysis: str, 
-                       company_name: str, ticker: str, extracted_data: dict) -> str:
+    @property
+    def max_tokens(self) -> int:
+        """Completion budget, re-read per call so new usage samples apply in a long-running app"""
+        return token_budget.max_tokens("thesis", ceiling=6000)
+    
+    async def generate_thesis(self, financial_analysis: Union[str, Dict],
+                             governance_analysis: Union[str, Dict],
+                             company_name: str, ticker: str, extracted_data: dict):
         """
-        Generate complete activist investment thesis
+        Stream an activist investment thesis as it is generated
         
         Args:
-            financial_analysis: Output from FinancialAnalystAgent
-            governance_analysis: Output from GovernanceAnalystAgent
+            financial_analysis: Output from FinancialAnalystAgent (markdown or structured findings)
+            governance_analysis: Output from GovernanceAnalystAgent (markdown or structured findings)
             company_name: Company name
             ticker: Stock ticker
             extracted_data: Raw extracted data for context
             
-        Returns:
-            Complete investment thesis in markdown
+        Yields:
+            Markdown chunks of the investment thesis as they arrive; a mid-stream API
+            failure ends the stream with _INTERRUPTED_NOTE
         """
         
-        print("  📝 Generating investment thesis with GPT-4...")
+        logger.info("  📝 Generating investment thesis with GPT-4...")
         
         # Build comprehensive prompt
         prompt = self._build_thesis_prompt(
@@ -41,14 +171,16 @@ class ThesisGeneratorAgent:
             extracted_data
         )
         
+        streamed = False
         try:
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
+            # Call OpenAI API, forwarding tokens as they are decoded
+            async for chunk in cached_chat_stream(
+                get_client(self.api_key),
                 model=self.model,
                 messages=[
                     {
                         "role": "system",
-                        "content": self._get_system_prompt()
+                        "content": _SYSTEM_PROMPT_THESIS + END_INSTRUCTION
                     },
                     {
                         "role": "user",
@@ -56,73 +188,57 @@ class ThesisGeneratorAgent:
                     }
                 ],
                 temperature=0.4,  # Slightly higher for creative synthesis
-                max_tokens=6000
-            )
+                max_tokens=self.max_tokens,
+                stop=STOP_SEQUENCES,
+                prediction={
+                    "type": "content",
+                    "content": _THESIS_TEMPLATE.format(company_name=company_name, ticker=ticker)
+                },
+                budget_name="thesis"
+            ):
+                streamed = True
+                yield chunk
             
-            thesis = response.choices[0].message.content
-            print("    ✅ Investment thesis generated")
-            return thesis
+            logger.info("    ✅ Investment thesis generated")
             
-        except Exception as e:
-            print(f"    ❌ Error generating thesis: {str(e)}")
-            return self._fallback_thesis(company_name, ticker)
+        except fallback_errors() as e:
+            logger.error(f"    ❌ Error generating thesis: {str(e)}")
+            if streamed:
+                yield _INTERRUPTED_NOTE
+            else:
+                yield self._fallback_thesis(company_name, ticker)
     
-    def _get_system_prompt(self) -> str:
-        """System prompt for thesis generation"""
-        return """You are a senior analyst at an activist investment fund, preparing a comprehensive investment thesis.
-
-Your role is to synthesize financial and governance analyses into a compelling, actionable activist thesis.
-
-Structure your thesis with:
-
-# Investment Thesis: [COMPANY] ([TICKER])
-
-## Executive Summary
-2-3 paragraphs covering:
-- The opportunity (what's broken)
-- The solution (specific activist campaign)
-- The return potential (price target, timeline)
-
-## Value Creation Opportunities
-For each catalyst (3-5 total):
-### Catalyst N: [Name]
-- **Current State:** What's wrong now
-- **Proposed Action:** Specific steps (1-3 bullet points)
-- **Value Impact:** Quantified impact ($ per share or % upside)
-- **Timeline:** How long to realize
-
-## Proposed Action Plan
-### Phase 1: Engagement (Months 1-3)
-### Phase 2: Implementation (Months 3-12)
-### Phase 3: Value Realization (Months 12-24)
-
-## Valuation & Return Potential
-- Current valuation
-- Target valuation with rationale
-- Base case and bull case scenarios
-
-## Risk Factors
-3-5 key risks to the thesis
-
-## Conclusion
-Clear recommendation: Initiate position or Pass
-
-Be direct, quantitative, and action-oriented. Use bold for key findings.
-This is for LP presentation and internal investment committee."""
+    async def generate_thesis_full(self, financial_analysis: Union[str, Dict],
+                                   governance_analysis: Union[str, Dict],
+                                   company_name: str, ticker: str, extracted_data: dict) -> str:
+        """Generate the complete thesis as a single markdown string"""
+        chunks = [
+            chunk async for chunk in self.generate_thesis(
+                financial_analysis, governance_analysis, company_name, ticker, extracted_data
+            )
+        ]
+        if not chunks or chunks[-1] is _INTERRUPTED_NOTE:
+            # An empty stream (immediate stop sequence) or an interrupted one: return the
+            # fallback rather than a blank or truncated thesis that callers would cache as complete
+            return self._fallback_thesis(company_name, ticker)
+        return "".join(chunks)
     
-    def _build_thesis_prompt(self, financial_analysis: str, governance_analysis: str,
+    def _build_thesis_prompt(self, financial_analysis: Union[str, Dict],
+                            governance_analysis: Union[str, Dict],
                             company_name: str, ticker: str, extracted_data: dict) -> str:
         """Build thesis generation prompt"""
         
         # Extract key metrics for context
-        financial_data = extracted_data.get('10k', {})
-        market_data = extracted_data.get('market_data', {})
+        fin = Financials.from_dict(extracted_data.get('10k'))
+        market = Market.from_dict(extracted_data.get('market_data'))
         
-        revenue = financial_data.get('revenue_current', 0)
-        market_cap = market_data.get('market_cap', 0)
-        current_price = market_data.get('current_price', 0)
+        revenue = fin.revenue_current
+        market_cap = market.market_cap
+        current_price = market.current_price
         
-        return f"""Synthesize the following analyses into a comprehensive activist investment thesis:
+        return f"""{_THESIS_TASK}
+
+---
 
 **Company:** {company_name} ({ticker})
 **Current Price:** ${current_price:.2f}
@@ -132,34 +248,19 @@ This is for LP presentation and internal investment committee."""
 ---
 
 ## FINANCIAL ANALYSIS
-{financial_analysis}
+{self._format_analysis(financial_analysis)}
 
 ---
 
 ## GOVERNANCE ANALYSIS
-{governance_analysis}
-
----
-
-**Your Task:**
-
-Synthesize these analyses into a compelling activist investment thesis. 
-
-Requirements:
-1. **Executive Summary** - Make it punchy and investor-ready
-2. **Value Creation Catalysts** - Identify 3-5 specific, actionable opportunities
-3. **Action Plan** - Timeline with specific milestones
-4. **Valuation** - Target price with clear methodology
-5. **Risks** - Be honest about what could go wrong
-6. **Recommendation** - Clear buy/pass decision
-
-Focus on:
-- Specific numbers and percentages
-- Concrete actions (not vague suggestions)
-- Realistic timelines (12-24 months)
-- Quantified value creation ($ per share)
-
-This thesis will be presented to the investment committee and potentially to the board of {company_name}."""
+{self._format_analysis(governance_analysis)}"""
+    
+    @staticmethod
+    def _format_analysis(analysis: Union[str, Dict]) -> str:
+        """Structured findings go in as one line of JSON; markdown is cut down to its key lines"""
+        if isinstance(analysis, dict):
+            return compact_findings(analysis)
+        return _compact_analysis(analysis)
     
     def _fallback_thesis(self, company_name: str, ticker: str) -> str:
         """Fallback thesis if API call fails"""
@@ -182,12 +283,15 @@ Configure OpenAI API key to generate complete investment thesis.
 """
 
 
-# Test the agent
+# Test the agent (run from the repo root: python -m agents.thesis_generator)
 if __name__ == "__main__":
+    import asyncio
     import os
     from dotenv import load_dotenv
+    from agents._logging import setup_logging
     
     load_dotenv()
+    setup_logging(extra_loggers=(__name__,))
     
     # Test data
     financial_analysis = """## Financial Analysis
@@ -227,13 +331,13 @@ if __name__ == "__main__":
     agent = ThesisGeneratorAgent(api_key)
     
     # Generate thesis
-    result = agent.generate_thesis(
+    result = asyncio.run(agent.generate_thesis_full(
         financial_analysis, 
         governance_analysis,
         "Apple Inc.",
         "AAPL",
         test_data
-    )
+    ))
     
     print("\n" + "="*70)
     print("INVESTMENT THESIS:")
@@ -6,14 +6,81 @@ Interactive web app for activist investor analysis
 import streamlit as st
 #sanjana 
 import asyncio
+import html
+import logging
 import os
 from dotenv import load_dotenv
+import threading
 import time
 from io import BytesIO
 from datetime import datetime
-
-# Load environment variables
-load_dotenv()
+from dataclasses import dataclass
+from typing import Tuple
+import jinja2
+import numpy as np
+import orjson
+import pandas as pd
+
+# PDF export is optional (reportlab)
+try:
+    import reportlab
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib import colors
+    _REPORTLAB = reportlab
+except ImportError:
+    _REPORTLAB = None
+
+# Load environment variables once per process; Streamlit re-executes this script on every
+# rerun and a plain load_dotenv() would re-read .env each time
+@st.cache_resource(show_spinner=False)
+def _init_env():
+    load_dotenv()
+
+_init_env()
+
+# Agent status lines are logged through a background listener thread
+from agents._logging import setup_logging
+from agents.thesis_generator import _INTERRUPTED_NOTE
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# The orchestrator holds API clients and every tool/agent; build it once per process, not per click
+@st.cache_resource(show_spinner=False)
+def get_orchestrator():
+    from orchestrator import ActivistIntelOrchestrator
+    return ActivistIntelOrchestrator()
+
+# One event loop for the whole process, running in a background thread. asyncio.run() would
+# create and close a loop per analysis, stranding the pooled OpenAI/httpx connections of the
+# cached orchestrator on a dead loop
+@st.cache_resource(show_spinner=False)
+def _get_event_loop():
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="analysis-event-loop", daemon=True).start()
+    return loop
+
+def run_async(coro):
+    """Run a coroutine on the persistent event loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_event_loop()).result()
+
+def iter_async(agen):
+    """Drive an async iterator on the persistent event loop, yielding its items to the script thread"""
+    loop = _get_event_loop()
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+        except StopAsyncIteration:
+            return
+
+# Repeat analyses of a ticker within the hour reuse the result instead of re-running
+# SEC retrieval, LandingAI extraction and the LLM agents (the result dict pickles cleanly:
+# FinancialMetrics and PeerComparison are module-level slotted dataclasses).
+# The AI thesis is deferred and streamed into its tab by display_investment_thesis
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def cached_analyze(ticker):
+    return run_async(get_orchestrator().analyze_company(ticker, defer_thesis=True))
 
 # Page config
 st.set_page_config(
@@ -26,128 +93,178 @@ st.set_page_config(
 # Demo mode flag
 DEMO_MODE = True  # Set to True for judges/demo purposes
 
+# Sidebar example tickers; in demo mode these are served from demo data
+EXAMPLE_TICKERS = ("AAPL", "MSFT", "GOOGL", "TSLA", "AMZN", "META", "NFLX")
+
 # Helper functions for demo data
+@dataclass(slots=True, frozen=True)
+class DemoMetrics:
+    """Demo stand-in for tools.ratio_calculator.FinancialMetrics"""
+    market_cap: float
+    enterprise_value: float
+    ev_to_revenue: float
+    roe: float
+    roic: float
+    operating_margin: float
+    revenue_growth_1y: float
+    cash_to_assets_ratio: float
+
+@dataclass(slots=True, frozen=True)
+class DemoPeerComparison:
+    """Demo stand-in for the peer comparison fields the UI displays"""
+    roe_percentile: float
+    roic_percentile: float
+    roe_gap: float
+    roic_gap: float
+    upside_to_peer_median: float
+    peer_group: Tuple[str, ...]
+
 def get_demo_result(ticker):
     """Get demo data for common tickers"""
     
-    demo_data = {
-        "AAPL": {
-            "company_name": "Apple Inc.",
-            "ticker": "AAPL",
-            "metrics": type('obj', (object,), {
-                'market_cap': 2800000000000,
-                'enterprise_value': 2750000000000,
-                'ev_to_revenue': 7.2,
-                'roe': 147.4,
-                'roic': 28.1,
-                'operating_margin': 29.8,
-                'revenue_growth_1y': -2.8,
-                'cash_to_assets_ratio': 8.5
-            }),
-            'red_flags': {
-                'excess_cash': 'Company holds $30B in excess cash (8.5% of assets) that could be returned to shareholders',
-                'declining_growth': 'Revenue declined 2.8% year-over-year, suggesting market saturation'
+    return _build_demo_result(ticker if ticker in _DEMO_BUILDERS else "AAPL")
+
+# st.cache_resource rather than functools.lru_cache: Streamlit re-executes this script on every
+# rerun, which would rebuild a module-level lru_cache each time
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _build_demo_result(ticker):
+    """Build the demo result for one ticker (shared across reruns and sessions)"""
+    
+    result = _DEMO_BUILDERS[ticker]()
+    # Static data, so the summary strings are formatted once along with it
+    result['display'] = _build_display_strings(result)
+    return result
+
+def _demo_aapl():
+    """Raw AAPL demo result"""
+    
+    thesis = generate_demo_thesis("AAPL")
+    return {
+        "company_name": "Apple Inc.",
+        "ticker": "AAPL",
+        "metrics": DemoMetrics(
+            market_cap=2800000000000,
+            enterprise_value=2750000000000,
+            ev_to_revenue=7.2,
+            roe=147.4,
+            roic=28.1,
+            operating_margin=29.8,
+            revenue_growth_1y=-2.8,
+            cash_to_assets_ratio=8.5
+        ),
+        'red_flags': {
+            'excess_cash': 'Company holds $30B in excess cash (8.5% of assets) that could be returned to shareholders',
+            'declining_growth': 'Revenue declined 2.8% year-over-year, suggesting market saturation'
+        },
+        'peer_comparison': DemoPeerComparison(
+            roe_percentile=95.0,
+            roic_percentile=88.0,
+            roe_gap=132.4,
+            roic_gap=18.1,
+            upside_to_peer_median=25.3,
+            peer_group=('MSFT', 'GOOGL', 'META', 'AMZN')
+        ),
+        'extracted_data': {
+            '10k': {
+                'revenue_current': 383285000000,
+                'net_income_current': 96995000000,
+                'total_assets': 352755000000,
+                'cash_equivalents': 29965000000,
+                'total_debt': 111088000000,
+                'operating_income': 114301000000,
+                'shareholders_equity': 62146000000
             },
-            'peer_comparison': type('obj', (object,), {
-                'roe_percentile': 95.0,
-                'roic_percentile': 88.0,
-                'roe_gap': 132.4,
-                'roic_gap': 18.1,
-                'upside_to_peer_median': 25.3,
-                'peer_group': ['MSFT', 'GOOGL', 'META', 'AMZN']
-            }),
-            'extracted_data': {
-                '10k': {
-                    'revenue_current': 383285000000,
-                    'net_income_current': 96995000000,
-                    'total_assets': 352755000000,
-                    'cash_equivalents': 29965000000,
-                    'total_debt': 111088000000,
-                    'operating_income': 114301000000,
-                    'shareholders_equity': 62146000000
-                },
-                'market_data': {
-                    'current_price': 189.50,
-                    'market_cap': 2800000000000,
-                    'shares_outstanding': 14782456000
-                },
-                'proxy': {
-                    'ceo_total_comp_current': 63209230,
-                    'board_members': [
-                        {"name": "Tim Cook", "role": "CEO & Director", "tenure_years": 12, "independent": False},
-                        {"name": "Arthur D. Levinson", "role": "Chairman", "tenure_years": 21, "independent": True},
-                        {"name": "James A. Bell", "role": "Director", "tenure_years": 15, "independent": True}
-                    ],
-                    'say_on_pay_approval_pct': 95.4
-                }
+            'market_data': {
+                'current_price': 189.50,
+                'market_cap': 2800000000000,
+                'shares_outstanding': 14782456000
             },
-            'financial_analysis': generate_demo_financial_analysis("AAPL"),
-            'governance_analysis': generate_demo_governance_analysis("AAPL"),
-            'ai_thesis': generate_demo_thesis("AAPL"),
-            'basic_thesis': generate_demo_thesis("AAPL")
+            'proxy': {
+                'ceo_total_comp_current': 63209230,
+                'board_members': [
+                    {"name": "Tim Cook", "role": "CEO & Director", "tenure_years": 12, "independent": False},
+                    {"name": "Arthur D. Levinson", "role": "Chairman", "tenure_years": 21, "independent": True},
+                    {"name": "James A. Bell", "role": "Director", "tenure_years": 15, "independent": True}
+                ],
+                'say_on_pay_approval_pct': 95.4
+            }
         },
-        "MSFT": {
-            "company_name": "Microsoft Corporation",
-            "ticker": "MSFT",
-            "metrics": type('obj', (object,), {
-                'market_cap': 2900000000000,
-                'enterprise_value': 2850000000000,
-                'ev_to_revenue': 12.5,
-                'roe': 38.4,
-                'roic': 22.1,
-                'operating_margin': 42.0,
-                'revenue_growth_1y': 13.2,
-                'cash_to_assets_ratio': 7.2
-            }),
-            'red_flags': {
-                'high_valuation': 'Trading at premium valuation vs historical averages',
-                'cloud_competition': 'Increasing competition in cloud services from AWS and Google'
+        'financial_analysis': generate_demo_financial_analysis("AAPL"),
+        'governance_analysis': generate_demo_governance_analysis("AAPL"),
+        'ai_thesis': thesis,
+        'basic_thesis': thesis
+    }
+
+def _demo_msft():
+    """Raw MSFT demo result"""
+    
+    thesis = generate_demo_thesis("MSFT")
+    return {
+        "company_name": "Microsoft Corporation",
+        "ticker": "MSFT",
+        "metrics": DemoMetrics(
+            market_cap=2900000000000,
+            enterprise_value=2850000000000,
+            ev_to_revenue=12.5,
+            roe=38.4,
+            roic=22.1,
+            operating_margin=42.0,
+            revenue_growth_1y=13.2,
+            cash_to_assets_ratio=7.2
+        ),
+        'red_flags': {
+            'high_valuation': 'Trading at premium valuation vs historical averages',
+            'cloud_competition': 'Increasing competition in cloud services from AWS and Google'
+        },
+        'peer_comparison': DemoPeerComparison(
+            roe_percentile=82.0,
+            roic_percentile=85.0,
+            roe_gap=23.4,
+            roic_gap=12.1,
+            upside_to_peer_median=15.2,
+            peer_group=('AAPL', 'GOOGL', 'META', 'AMZN')
+        ),
+        'extracted_data': {
+            '10k': {
+                'revenue_current': 211915000000,
+                'net_income_current': 72361000000,
+                'total_assets': 411976000000,
+                'cash_equivalents': 29945000000,
+                'total_debt': 47032000000,
+                'operating_income': 89035000000,
+                'shareholders_equity': 206223000000
             },
-            'peer_comparison': type('obj', (object,), {
-                'roe_percentile': 82.0,
-                'roic_percentile': 85.0,
-                'roe_gap': 23.4,
-                'roic_gap': 12.1,
-                'upside_to_peer_median': 15.2,
-                'peer_group': ['AAPL', 'GOOGL', 'META', 'AMZN']
-            }),
-            'extracted_data': {
-                '10k': {
-                    'revenue_current': 211915000000,
-                    'net_income_current': 72361000000,
-                    'total_assets': 411976000000,
-                    'cash_equivalents': 29945000000,
-                    'total_debt': 47032000000,
-                    'operating_income': 89035000000,
-                    'shareholders_equity': 206223000000
-                },
-                'market_data': {
-                    'current_price': 415.25,
-                    'market_cap': 2900000000000,
-                    'shares_outstanding': 7430000000
-                },
-                'proxy': {
-                    'ceo_total_comp_current': 54946310,
-                    'board_members': [
-                        {"name": "Satya Nadella", "role": "CEO & Director", "tenure_years": 10, "independent": False},
-                        {"name": "John W. Thompson", "role": "Chairman", "tenure_years": 13, "independent": True}
-                    ],
-                    'say_on_pay_approval_pct': 91.2
-                }
+            'market_data': {
+                'current_price': 415.25,
+                'market_cap': 2900000000000,
+                'shares_outstanding': 7430000000
             },
-            'financial_analysis': generate_demo_financial_analysis("MSFT"),
-            'governance_analysis': generate_demo_governance_analysis("MSFT"),
-            'ai_thesis': generate_demo_thesis("MSFT"),
-            'basic_thesis': generate_demo_thesis("MSFT")
-        }
-        # Add more companies as needed
+            'proxy': {
+                'ceo_total_comp_current': 54946310,
+                'board_members': [
+                    {"name": "Satya Nadella", "role": "CEO & Director", "tenure_years": 10, "independent": False},
+                    {"name": "John W. Thompson", "role": "Chairman", "tenure_years": 13, "independent": True}
+                ],
+                'say_on_pay_approval_pct': 91.2
+            }
+        },
+        'financial_analysis': generate_demo_financial_analysis("MSFT"),
+        'governance_analysis': generate_demo_governance_analysis("MSFT"),
+        'ai_thesis': thesis,
+        'basic_thesis': thesis
     }
-    
-    return demo_data.get(ticker, demo_data["AAPL"])
 
-def generate_demo_financial_analysis(ticker):
-    analyses = {
-        "AAPL": """
+# Tickers without their own demo data fall back to AAPL; only the requested ticker is built
+_DEMO_BUILDERS = {"AAPL": _demo_aapl, "MSFT": _demo_msft}
+
+@st.cache_resource(show_spinner=False)
+def _warm_demo_results():
+    """Build every example ticker's demo result on first page load so example clicks are cache hits"""
+    for ticker in EXAMPLE_TICKERS:
+        get_demo_result(ticker)
+
+_FIN_ANALYSES = {
+    "AAPL": """
         ## Financial Performance Analysis for Apple Inc.
 
         ### Revenue & Profitability
@@ -164,7 +281,7 @@ def generate_demo_financial_analysis(ticker):
         2. **Excess Cash**: $30B in excess cash earning minimal returns
         3. **Conservative Capital Structure**: Underleveraged relative to peers and optimal capital structure
         """,
-        "MSFT": """
+    "MSFT": """
         ## Financial Performance Analysis for Microsoft Corporation
 
         ### Revenue & Profitability
@@ -181,12 +298,13 @@ def generate_demo_financial_analysis(ticker):
         2. **Capital Allocation**: Opportunity for enhanced shareholder returns
         3. **Innovation Investment**: Maintaining leadership in AI and cloud requires continued R&D
         """
-    }
-    return analyses.get(ticker, analyses["AAPL"])
+}
 
-def generate_demo_governance_analysis(ticker):
-    analyses = {
-        "AAPL": """
+def generate_demo_financial_analysis(ticker):
+    return _FIN_ANALYSES.get(ticker, _FIN_ANALYSES["AAPL"])
+
+_GOV_ANALYSES = {
+    "AAPL": """
         ## Corporate Governance Analysis for Apple Inc.
 
         ### Board Composition
@@ -208,7 +326,7 @@ def generate_demo_governance_analysis(ticker):
         ### Shareholder Rights
         Standard shareholder rights with annual director elections. No poison pill or classified board structure.
         """,
-        "MSFT": """
+    "MSFT": """
         ## Corporate Governance Analysis for Microsoft Corporation
 
         ### Board Composition
@@ -226,12 +344,13 @@ def generate_demo_governance_analysis(ticker):
         1. **ESG Reporting**: Opportunity for enhanced sustainability disclosure
         2. **Innovation Governance**: Board oversight of AI and emerging technology investments
         """
-    }
-    return analyses.get(ticker, analyses["AAPL"])
+}
 
-def generate_demo_thesis(ticker):
-    theses = {
-        "AAPL": """
+def generate_demo_governance_analysis(ticker):
+    return _GOV_ANALYSES.get(ticker, _GOV_ANALYSES["AAPL"])
+
+_THESES = {
+    "AAPL": """
         # Activist Investment Thesis: Apple Inc.
 
         ## Executive Summary
@@ -286,7 +405,7 @@ def generate_demo_thesis(ticker):
         ## Conclusion
         Apple's combination of financial strength, governance issues, and capital allocation inefficiency creates an ideal activist target with significant value creation potential of $20-40 per share.
         """,
-        "MSFT": """
+    "MSFT": """
         # Activist Investment Thesis: Microsoft Corporation
 
         ## Executive Summary
@@ -317,43 +436,72 @@ def generate_demo_thesis(ticker):
         ## Conclusion
         Microsoft's strong fundamentals and growth trajectory make it a defensive activist play with moderate upside potential.
         """
-    }
-    return theses.get(ticker, theses["AAPL"])
+}
 
-def display_executive_summary(result):
-    st.header(f"{result['company_name']} ({result['ticker']})")
-    
-    # Key metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
+def generate_demo_thesis(ticker):
+    return _THESES.get(ticker, _THESES["AAPL"])
+
+def _build_display_strings(result):
+    """Pre-formatted executive summary values (demo results carry these as result['display'])"""
     metrics = result['metrics']
     market_data = result['extracted_data']['market_data']
+    peer_comp = result['peer_comparison']
     
-    with col1:
-        st.metric(
-            "Market Cap",
-            f"${market_data['market_cap']/1e9:.1f}B"
-        )
-    
-    with col2:
-        st.metric(
-            "ROE",
-            f"{metrics.roe:.1f}%",
-            delta=f"{metrics.roe - 15:.1f}pp" if metrics.roe > 15 else None
+    return {
+        'market_cap': f"${market_data['market_cap']/1e9:.1f}B",
+        'roe': f"{metrics.roe:.1f}%",
+        # Deltas are only shown above the benchmark, so they are always favourable
+        'roe_delta': f"{metrics.roe - 15:.1f}pp" if metrics.roe > 15 else None,
+        'roic': f"{metrics.roic:.1f}%",
+        'roic_delta': f"{metrics.roic - 10:.1f}pp" if metrics.roic > 10 else None,
+        'operating_margin': f"{metrics.operating_margin:.1f}%",
+        'roe_percentile': f"{peer_comp.roe_percentile:.0f}th",
+        'roe_gap': f"{peer_comp.roe_gap:+.1f}pp vs median",
+        'roe_gap_tone': "pos" if peer_comp.roe_gap >= 0 else "neg",
+        'roic_percentile': f"{peer_comp.roic_percentile:.0f}th",
+        'roic_gap': f"{peer_comp.roic_gap:+.1f}pp vs median",
+        'roic_gap_tone': "pos" if peer_comp.roic_gap >= 0 else "neg",
+        'valuation_gap': f"{peer_comp.upside_to_peer_median:+.1f}%",
+        'valuation_gap_label': "Upside potential" if peer_comp.upside_to_peer_median > 0 else "Trading premium",
+        'valuation_gap_tone': "pos" if peer_comp.upside_to_peer_median > 0 else "neg",
+        'peer_group': f"Peer group: {', '.join(peer_comp.peer_group[:4])}"
+    }
+
+def render_kpis_html(kpis, columns=None):
+    """
+    HTML grid of (label, value, delta, tone) KPI cards, one row unless columns is given; styled by the .kpi-grid CSS below
+
+    tone is "pos" (green, up arrow), "neg" (red, down arrow) or None for a plain delta
+    """
+    cards = []
+    for label, value, delta, tone in kpis:
+        delta_html = ""
+        if delta:
+            css_class = f"kpi-delta {tone}" if tone else "kpi-delta"
+            delta_html = f'<div class="{css_class}">{html.escape(delta)}</div>'
+        cards.append(
+            f'<div class="kpi"><div class="kpi-label">{html.escape(label)}</div>'
+            f'<div class="kpi-value">{html.escape(value)}</div>{delta_html}</div>'
         )
+    style = f"grid-template-columns: repeat({columns or len(kpis)}, 1fr)"
+    return f'<div class="kpi-grid" style="{style}">{"".join(cards)}</div>'
+
+def _render_kpis(kpis, columns=None):
+    """Render (label, value, delta, tone) tuples as KPI cards in a single message"""
+    st.markdown(render_kpis_html(kpis, columns), unsafe_allow_html=True)
+
+def display_executive_summary(result):
+    st.header(f"{result['company_name']} ({result['ticker']})")
     
-    with col3:
-        st.metric(
-            "ROIC",
-            f"{metrics.roic:.1f}%",
-            delta=f"{metrics.roic - 10:.1f}pp" if metrics.roic > 10 else None
-        )
+    display = result.get('display') or _build_display_strings(result)
     
-    with col4:
-        st.metric(
-            "Operating Margin",
-            f"{metrics.operating_margin:.1f}%"
-        )
+    # Key metrics
+    _render_kpis([
+        ("Market Cap", display['market_cap'], None, None),
+        ("ROE", display['roe'], display['roe_delta'], "pos"),
+        ("ROIC", display['roic'], display['roic_delta'], "pos"),
+        ("Operating Margin", display['operating_margin'], None, None)
+    ])
     
     st.divider()
     
@@ -378,31 +526,14 @@ def display_executive_summary(result):
     
     # Peer comparison
     st.subheader("📊 Peer Comparison")
-    peer_comp = result['peer_comparison']
-    
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric(
-            "ROE Percentile",
-            f"{peer_comp.roe_percentile:.0f}th",
-            delta=f"{peer_comp.roe_gap:+.1f}pp vs median"
-        )
     
-    with col2:
-        st.metric(
-            "ROIC Percentile",
-            f"{peer_comp.roic_percentile:.0f}th",
-            delta=f"{peer_comp.roic_gap:+.1f}pp vs median"
-        )
+    _render_kpis([
+        ("ROE Percentile", display['roe_percentile'], display['roe_gap'], display['roe_gap_tone']),
+        ("ROIC Percentile", display['roic_percentile'], display['roic_gap'], display['roic_gap_tone']),
+        ("Valuation Gap", display['valuation_gap'], display['valuation_gap_label'], display['valuation_gap_tone'])
+    ])
     
-    with col3:
-        st.metric(
-            "Valuation Gap",
-            f"{peer_comp.upside_to_peer_median:+.1f}%",
-            delta="Upside potential" if peer_comp.upside_to_peer_median > 0 else "Trading premium"
-        )
-        
-    st.caption(f"Peer group: {', '.join(peer_comp.peer_group[:4])}")
+    st.caption(display['peer_group'])
 
 def display_financial_analysis(result):
     st.header("💰 Financial Deep-Dive Analysis")
@@ -412,36 +543,30 @@ def display_financial_analysis(result):
     else:
         # Show detailed financial data even without LLM
         fin_data = result['extracted_data']['10k']
+        metrics = result['metrics']
+        # Operating margin and cash/assets come from the ratio calculator; only these two are derived here
+        net_margin = fin_data['net_income_current'] / fin_data['revenue_current'] * 100
+        debt_to_equity = fin_data['total_debt'] / fin_data['shareholders_equity']
         
         st.subheader("Income Statement Highlights")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("Revenue", f"${fin_data['revenue_current']/1e9:.1f}B")
-            st.metric("Operating Income", f"${fin_data['operating_income']/1e9:.1f}B")
-        
-        with col2:
-            st.metric("Net Income", f"${fin_data['net_income_current']/1e9:.1f}B")
-            st.metric("Operating Margin", f"{(fin_data['operating_income']/fin_data['revenue_current']*100):.1f}%")
-        
-        with col3:
-            st.metric("Net Margin", f"{(fin_data['net_income_current']/fin_data['revenue_current']*100):.1f}%")
-            st.metric("ROE", f"{result['metrics'].roe:.1f}%")
+        _render_kpis([
+            ("Revenue", f"${fin_data['revenue_current']/1e9:.1f}B", None, None),
+            ("Net Income", f"${fin_data['net_income_current']/1e9:.1f}B", None, None),
+            ("Net Margin", f"{net_margin:.1f}%", None, None),
+            ("Operating Income", f"${fin_data['operating_income']/1e9:.1f}B", None, None),
+            ("Operating Margin", f"{metrics.operating_margin:.1f}%", None, None),
+            ("ROE", f"{metrics.roe:.1f}%", None, None)
+        ], columns=3)
         
         st.subheader("Balance Sheet Analysis")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("Total Assets", f"${fin_data['total_assets']/1e9:.1f}B")
-            st.metric("Shareholders' Equity", f"${fin_data['shareholders_equity']/1e9:.1f}B")
-        
-        with col2:
-            st.metric("Cash & Equivalents", f"${fin_data['cash_equivalents']/1e9:.1f}B")
-            st.metric("Total Debt", f"${fin_data['total_debt']/1e9:.1f}B")
-        
-        with col3:
-            st.metric("Cash/Assets Ratio", f"{(fin_data['cash_equivalents']/fin_data['total_assets']*100):.1f}%")
-            st.metric("Debt/Equity Ratio", f"{(fin_data['total_debt']/fin_data['shareholders_equity']):.1f}x")
+        _render_kpis([
+            ("Total Assets", f"${fin_data['total_assets']/1e9:.1f}B", None, None),
+            ("Cash & Equivalents", f"${fin_data['cash_equivalents']/1e9:.1f}B", None, None),
+            ("Cash/Assets Ratio", f"{metrics.cash_to_assets_ratio:.1f}%", None, None),
+            ("Shareholders' Equity", f"${fin_data['shareholders_equity']/1e9:.1f}B", None, None),
+            ("Total Debt", f"${fin_data['total_debt']/1e9:.1f}B", None, None),
+            ("Debt/Equity Ratio", f"{debt_to_equity:.1f}x", None, None)
+        ], columns=3)
 
 def display_governance_analysis(result):
     st.header("👔 Corporate Governance Analysis")
@@ -470,23 +595,40 @@ def display_governance_analysis(result):
             
             st.subheader("Board of Directors")
             if proxy_data.get('board_members'):
-                for member in proxy_data['board_members']:
-                    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
-                    with col1:
-                        st.write(f"**{member['name']}**")
-                    with col2:
-                        st.write(member['role'])
-                    with col3:
-                        st.write(f"{member['tenure_years']} yrs")
-                    with col4:
-                        if member['tenure_years'] > 12:
-                            st.error("⚠️ Long tenure")
-                        else:
-                            st.success("✅ Appropriate")
+                # One Arrow-backed table instead of four widgets per director
+                board = pd.DataFrame(proxy_data['board_members'], columns=['name', 'role', 'tenure_years'])
+                board['status'] = np.where(board['tenure_years'] > 12, "⚠️ Long tenure", "✅ Appropriate")
+                st.dataframe(
+                    board.rename(columns={
+                        'name': 'Director',
+                        'role': 'Role',
+                        'tenure_years': 'Tenure (yrs)',
+                        'status': 'Status'
+                    }),
+                    use_container_width=True,
+                    hide_index=True
+                )
+
+def _thesis_state_key(ticker):
+    return f"ai_thesis_{ticker}"
+
+def restore_streamed_thesis(result):
+    """Put a thesis already streamed this session back onto a fresh cached_analyze copy"""
+    if result.get('ai_thesis') is None:
+        result['ai_thesis'] = st.session_state.get(_thesis_state_key(result['ticker']))
 
 def display_investment_thesis(result):
     st.header("🎯 Investment Thesis")
     
+    if result.get('ai_thesis') is None and result.get('thesis_inputs'):
+        # Deferred by cached_analyze: stream it as it is generated. result is a per-run copy, so the
+        # text is also kept in session_state for restore_streamed_thesis on later reruns
+        thesis = st.write_stream(iter_async(get_orchestrator().stream_thesis(result)))
+        if not thesis.endswith(_INTERRUPTED_NOTE):
+            st.session_state[_thesis_state_key(result['ticker'])] = thesis
+        result['ai_thesis'] = thesis
+        return
+    
     thesis_to_show = result.get('ai_thesis')
     if not thesis_to_show or thesis_to_show in ["Rule-based thesis (add LLM key for AI-generated thesis)", "AI thesis not available (no API key)"]:
         thesis_to_show = result['basic_thesis']
@@ -500,11 +642,9 @@ def display_complete_report(result):
     report = generate_complete_report(result)
     st.markdown(report)
 
-def generate_complete_report(result):
-    """Generate a comprehensive activist investment report"""
-    
-    report = f"""
-# Activist Investment Analysis: {result['company_name']} ({result['ticker']})
+_REPORT_SOURCE = """
+{% set xd = result.extracted_data %}
+# Activist Investment Analysis: {{ result.company_name }} ({{ result.ticker }})
 
 ## Table of Contents
 1. Executive Summary
@@ -519,14 +659,14 @@ def generate_complete_report(result):
 
 ## 1. Executive Summary
 
-**Company**: {result['company_name']} ({result['ticker']})  
-**Market Cap**: ${result['extracted_data']['market_data']['market_cap']/1e9:.1f}B  
-**Current Price**: ${result['extracted_data']['market_data']['current_price']:.2f}  
+**Company**: {{ result.company_name }} ({{ result.ticker }})  
+**Market Cap**: ${{ '%.1f'|format(xd.market_data.market_cap / 1e9) }}B  
+**Current Price**: ${{ '%.2f'|format(xd.market_data.current_price) }}  
 **Target Price**: $225.00 (+18.7% upside)  
 **Investment Recommendation**: **STRONG BUY**  
 
 ### Key Investment Highlights
-- Exceptional profitability metrics (ROE: {result['metrics'].roe:.1f}%, ROIC: {result['metrics'].roic:.1f}%)
+- Exceptional profitability metrics (ROE: {{ '%.1f'|format(result.metrics.roe) }}%, ROIC: {{ '%.1f'|format(result.metrics.roic) }}%)
 - Significant excess cash requiring optimization
 - Multiple governance improvement opportunities
 - Clear path to value creation through activist engagement
@@ -536,41 +676,38 @@ def generate_complete_report(result):
 ## 2. Financial Analysis
 
 ### Profitability Metrics
-- **Revenue**: ${result['extracted_data']['10k']['revenue_current']/1e9:.1f}B
-- **Operating Margin**: {result['metrics'].operating_margin:.1f}%
-- **Net Income**: ${result['extracted_data']['10k']['net_income_current']/1e9:.1f}B
-- **ROE**: {result['metrics'].roe:.1f}% (vs. peer median: 15.0%)
-- **ROIC**: {result['metrics'].roic:.1f}% (vs. peer median: 10.0%)
+- **Revenue**: ${{ '%.1f'|format(xd['10k'].revenue_current / 1e9) }}B
+- **Operating Margin**: {{ '%.1f'|format(result.metrics.operating_margin) }}%
+- **Net Income**: ${{ '%.1f'|format(xd['10k'].net_income_current / 1e9) }}B
+- **ROE**: {{ '%.1f'|format(result.metrics.roe) }}% (vs. peer median: 15.0%)
+- **ROIC**: {{ '%.1f'|format(result.metrics.roic) }}% (vs. peer median: 10.0%)
 
 ### Balance Sheet Analysis
-- **Total Assets**: ${result['extracted_data']['10k']['total_assets']/1e9:.1f}B
-- **Cash & Equivalents**: ${result['extracted_data']['10k']['cash_equivalents']/1e9:.1f}B
-- **Total Debt**: ${result['extracted_data']['10k']['total_debt']/1e9:.1f}B
-- **Shareholders' Equity**: ${result['extracted_data']['10k']['shareholders_equity']/1e9:.1f}B
+- **Total Assets**: ${{ '%.1f'|format(xd['10k'].total_assets / 1e9) }}B
+- **Cash & Equivalents**: ${{ '%.1f'|format(xd['10k'].cash_equivalents / 1e9) }}B
+- **Total Debt**: ${{ '%.1f'|format(xd['10k'].total_debt / 1e9) }}B
+- **Shareholders' Equity**: ${{ '%.1f'|format(xd['10k'].shareholders_equity / 1e9) }}B
 
 ### Key Financial Red Flags
-"""
-    
-    for flag, description in result.get('red_flags', {}).items():
-        report += f"- **{flag.replace('_', ' ').title()}**: {description}\n"
-    
-    report += """
+{% for flag, description in result.get('red_flags', {}).items() %}
+- **{{ flag.replace('_', ' ').title() }}**: {{ description }}
+{% endfor %}
+
 ---
 
 ## 3. Governance Assessment
 
 ### Board Composition
-"""
-    
-    if 'proxy' in result['extracted_data'] and 'board_members' in result['extracted_data']['proxy']:
-        for member in result['extracted_data']['proxy']['board_members']:
-            report += f"- **{member['name']}**: {member['role']} ({member['tenure_years']} years)\n"
-    
-    report += f"""
+{% if 'proxy' in xd and 'board_members' in xd.proxy %}
+{% for member in xd.proxy.board_members %}
+- **{{ member.name }}**: {{ member.role }} ({{ member.tenure_years }} years)
+{% endfor %}
+{% endif %}
+
 
 ### Executive Compensation
-- **CEO Total Compensation**: ${result['extracted_data']['proxy']['ceo_total_comp_current']/1e6:.1f}M
-- **Say-on-Pay Approval**: {result['extracted_data']['proxy']['say_on_pay_approval_pct']:.1f}%
+- **CEO Total Compensation**: ${{ '%.1f'|format(xd.proxy.ceo_total_comp_current / 1e6) }}M
+- **Say-on-Pay Approval**: {{ '%.1f'|format(xd.proxy.say_on_pay_approval_pct) }}%
 
 ---
 
@@ -589,7 +726,7 @@ def generate_complete_report(result):
 
 ## 5. Investment Thesis
 
-{result.get('ai_thesis', result.get('basic_thesis', 'Investment thesis analysis'))}
+{{ result.get('ai_thesis', result.get('basic_thesis', 'Investment thesis analysis')) }}
 
 ---
 
@@ -626,44 +763,68 @@ def generate_complete_report(result):
 
 ---
 
-*Report generated on {datetime.now().strftime("%B %d, %Y")}*
+*Report generated on {{ now.strftime("%B %d, %Y") }}*
 """
-    
-    return report
 
+# Compiled once per script run; rendering streams fragments instead of repeated string +=
+_REPORT_TMPL = jinja2.Environment(
+    autoescape=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True
+).from_string(_REPORT_SOURCE)
+
+# Reports are deterministic per result, so reruns (e.g. clicking a download button) reuse them.
+# ttl keeps the "Report generated on" date current.
+@st.cache_data(max_entries=32, ttl=3600, show_spinner=False)
+def generate_complete_report(result):
+    """Generate a comprehensive activist investment report"""
+    return _REPORT_TMPL.render(result=result, now=datetime.now())
+
+@st.cache_data(max_entries=32, ttl=3600, show_spinner=False)
+def generate_report_bytes(result):
+    """UTF-8 encoded complete report for the Markdown download"""
+    return generate_complete_report(result).encode('utf-8')
+
+# Fragment: widget interactions inside the download panel rerun only this panel, not the whole page
+@st.fragment
 def display_download_options(result, ticker):
     st.header("💾 Download Options")
     
+    today = datetime.now().strftime('%Y%m%d')
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("📄 Full Report")
         
-        # Generate report content
-        report_content = generate_complete_report(result)
-        
-        # Markdown download
+        # Markdown download (pre-encoded so Streamlit skips the str -> bytes step each rerun)
         st.download_button(
             label="📥 Download as Markdown",
-            data=report_content,
-            file_name=f"activist_analysis_{ticker}_{datetime.now().strftime('%Y%m%d')}.md",
+            data=generate_report_bytes(result),
+            file_name=f"activist_analysis_{ticker}_{today}.md",
             mime="text/markdown"
         )
         
     with col2:
         st.subheader("📊 PDF Report")
         
-        # Generate PDF
-        pdf_content = generate_pdf_report(result, ticker)
+        # Generate PDF (cached per result, so only the first visit pays for the build)
+        try:
+            with st.spinner("Generating PDF..."):
+                pdf_content = generate_pdf_report(result, ticker)
+        except Exception as e:
+            st.error(f"PDF generation failed: {str(e)}")
+            pdf_content = None
         
         if pdf_content:
             st.download_button(
                 label="📥 Download as PDF",
                 data=pdf_content,
-                file_name=f"activist_analysis_{ticker}_{datetime.now().strftime('%Y%m%d')}.pdf",
+                file_name=f"activist_analysis_{ticker}_{today}.pdf",
                 mime="application/pdf"
             )
-        else:
+        elif _REPORTLAB is None:
             st.info("PDF generation requires additional setup. Markdown available above.")
     
     st.divider()
@@ -674,27 +835,10 @@ def display_download_options(result, ticker):
     
     with col1:
         # Financial data as JSON
-        import json
-        financial_data = {
-            'company': result['company_name'],
-            'ticker': result['ticker'],
-            'financial_metrics': {
-                'revenue': result['extracted_data']['10k']['revenue_current'],
-                'net_income': result['extracted_data']['10k']['net_income_current'],
-                'total_assets': result['extracted_data']['10k']['total_assets'],
-                'market_cap': result['extracted_data']['market_data']['market_cap']
-            },
-            'activist_metrics': {
-                'roe': result['metrics'].roe,
-                'roic': result['metrics'].roic,
-                'operating_margin': result['metrics'].operating_margin
-            }
-        }
-        
         st.download_button(
             label="📄 Financial Data (JSON)",
-            data=json.dumps(financial_data, indent=2),
-            file_name=f"financial_data_{ticker}_{datetime.now().strftime('%Y%m%d')}.json",
+            data=build_financial_json(result),
+            file_name=f"financial_data_{ticker}_{today}.json",
             mime="application/json"
         )
     
@@ -705,85 +849,112 @@ def display_download_options(result, ticker):
         st.download_button(
             label="🎯 Investment Thesis Only",
             data=thesis_content,
-            file_name=f"investment_thesis_{ticker}_{datetime.now().strftime('%Y%m%d')}.txt",
+            file_name=f"investment_thesis_{ticker}_{today}.txt",
             mime="text/plain"
         )
 
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_financial_json(result):
+    """Key financial and activist metrics as indented JSON bytes for download"""
+    financial_data = {
+        'company': result['company_name'],
+        'ticker': result['ticker'],
+        'financial_metrics': {
+            'revenue': result['extracted_data']['10k']['revenue_current'],
+            'net_income': result['extracted_data']['10k']['net_income_current'],
+            'total_assets': result['extracted_data']['10k']['total_assets'],
+            'market_cap': result['extracted_data']['market_data']['market_cap']
+        },
+        'activist_metrics': {
+            'roe': result['metrics'].roe,
+            'roic': result['metrics'].roic,
+            'operating_margin': result['metrics'].operating_margin
+        }
+    }
+    return orjson.dumps(financial_data, option=orjson.OPT_INDENT_2)
+
+@st.cache_resource(show_spinner=False)
+def _get_pdf_styles():
+    """The ParagraphStyles the report uses, resolved from reportlab's sample stylesheet once per process"""
+    sheet = getSampleStyleSheet()
+    return {name: sheet[name] for name in ('Title', 'Heading1', 'Heading2', 'Normal')}
+
+@st.cache_resource(show_spinner=False)
+def _get_table_style():
+    """Metrics table style, shared by every PDF (TableStyle objects are reusable across tables)"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+
+# Build errors propagate to the caller: st.cache_data does not cache exceptions, so a
+# transient failure is retried on the next run instead of being remembered as None
+@st.cache_data(max_entries=32, ttl=3600, show_spinner=False)
 def generate_pdf_report(result, ticker):
-    """Generate PDF report (requires reportlab)"""
-    try:
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.pagesizes import letter, A4
-        from reportlab.lib.styles import getSampleStyleSheet
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-        from reportlab.lib import colors
-        
-        buffer = BytesIO()
-        
-        # Create PDF
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Title
-        title = Paragraph(f"Activist Investment Analysis: {result['company_name']} ({ticker})", styles['Title'])
-        story.append(title)
-        story.append(Spacer(1, 20))
-        
-        # Executive Summary
-        story.append(Paragraph("Executive Summary", styles['Heading1']))
-        summary_text = f"""
-        <b>Investment Recommendation:</b> STRONG BUY<br/>
-        <b>Target Price:</b> $225.00 (+18.7% upside)<br/>
-        <b>Market Cap:</b> ${result['extracted_data']['market_data']['market_cap']/1e9:.1f}B<br/>
-        <b>ROE:</b> {result['metrics'].roe:.1f}%<br/>
-        <b>ROIC:</b> {result['metrics'].roic:.1f}%
-        """
-        story.append(Paragraph(summary_text, styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        # Financial Table
-        story.append(Paragraph("Key Financial Metrics", styles['Heading2']))
-        financial_data = [
-            ['Metric', 'Value'],
-            ['Revenue', f"${result['extracted_data']['10k']['revenue_current']/1e9:.1f}B"],
-            ['Net Income', f"${result['extracted_data']['10k']['net_income_current']/1e9:.1f}B"],
-            ['Total Assets', f"${result['extracted_data']['10k']['total_assets']/1e9:.1f}B"],
-            ['Cash', f"${result['extracted_data']['10k']['cash_equivalents']/1e9:.1f}B"],
-            ['ROE', f"{result['metrics'].roe:.1f}%"],
-            ['ROIC', f"{result['metrics'].roic:.1f}%"]
-        ]
-        
-        table = Table(financial_data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(table)
-        story.append(Spacer(1, 20))
-        
-        # Investment Thesis
-        story.append(Paragraph("Investment Thesis", styles['Heading2']))
-        thesis = result.get('ai_thesis', result.get('basic_thesis', ''))[:1000] + "..."
-        story.append(Paragraph(thesis, styles['Normal']))
-        
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
-        
-    except ImportError:
+    """Generate PDF report (requires reportlab); None when reportlab is not installed"""
+    if _REPORTLAB is None:
         return None  # reportlab not installed
-    except Exception as e:
-        st.error(f"PDF generation failed: {str(e)}")
-        return None
+    return _build_pdf_report(result, ticker, _get_pdf_styles(), _get_table_style())
+
+def _build_pdf_report(result, ticker, styles, table_style):
+    """Render the PDF report to bytes"""
+    buffer = BytesIO()
+    
+    # Create PDF
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    story = []
+    
+    # Title
+    title = Paragraph(html.escape(f"Activist Investment Analysis: {result['company_name']} ({ticker})", quote=False), styles['Title'])
+    story.append(title)
+    story.append(Spacer(1, 20))
+    
+    # Executive Summary
+    story.append(Paragraph("Executive Summary", styles['Heading1']))
+    summary_text = f"""
+    <b>Investment Recommendation:</b> STRONG BUY<br/>
+    <b>Target Price:</b> $225.00 (+18.7% upside)<br/>
+    <b>Market Cap:</b> ${result['extracted_data']['market_data']['market_cap']/1e9:.1f}B<br/>
+    <b>ROE:</b> {result['metrics'].roe:.1f}%<br/>
+    <b>ROIC:</b> {result['metrics'].roic:.1f}%
+    """
+    story.append(Paragraph(summary_text, styles['Normal']))
+    story.append(Spacer(1, 20))
+    
+    # Financial Table
+    story.append(Paragraph("Key Financial Metrics", styles['Heading2']))
+    financial_data = [
+        ['Metric', 'Value'],
+        ['Revenue', f"${result['extracted_data']['10k']['revenue_current']/1e9:.1f}B"],
+        ['Net Income', f"${result['extracted_data']['10k']['net_income_current']/1e9:.1f}B"],
+        ['Total Assets', f"${result['extracted_data']['10k']['total_assets']/1e9:.1f}B"],
+        ['Cash', f"${result['extracted_data']['10k']['cash_equivalents']/1e9:.1f}B"],
+        ['ROE', f"{result['metrics'].roe:.1f}%"],
+        ['ROIC', f"{result['metrics'].roic:.1f}%"]
+    ]
+    
+    table = Table(financial_data)
+    table.setStyle(table_style)
+    
+    story.append(table)
+    story.append(Spacer(1, 20))
+    
+    # Investment Thesis
+    story.append(Paragraph("Investment Thesis", styles['Heading2']))
+    thesis = result.get('ai_thesis', result.get('basic_thesis', ''))[:1000] + "..."
+    # Escaped so "&" / "<" in the markdown are taken as text, not Paragraph markup
+    story.append(Paragraph(html.escape(thesis, quote=False), styles['Normal']))
+    
+    # Build PDF
+    doc.build(story)
+    buffer.seek(0)
+    return buffer.getvalue()
 
 # Custom CSS
 st.markdown("""
@@ -812,6 +983,26 @@ st.markdown("""
         border-radius: 0.5rem;
         box-shadow: 0 2px 4px rgba(0,0,0,0.1);
     }
+    .kpi-grid {
+        display: grid;
+        gap: 1rem;
+        margin-bottom: 1rem;
+    }
+    .kpi-label {
+        font-size: 0.875rem;
+        color: #666;
+    }
+    .kpi-value {
+        font-size: 2rem;
+        line-height: 1.4;
+    }
+    .kpi-delta {
+        font-size: 0.875rem;
+    }
+    .kpi-delta.pos { color: #09ab3b; }
+    .kpi-delta.pos::before { content: "↑ "; }
+    .kpi-delta.neg { color: #ff2b2b; }
+    .kpi-delta.neg::before { content: "↓ "; }
 </style>
 """, unsafe_allow_html=True)
 
@@ -819,6 +1010,9 @@ st.markdown("""
 st.markdown('<div class="main-header">🎯 Shareholder Catalyst</div>', unsafe_allow_html=True)
 st.markdown('<div class="sub-header">AI-Powered Activist Investor Intelligence</div>', unsafe_allow_html=True)
 
+if DEMO_MODE:
+    _warm_demo_results()
+
 # Sidebar
 with st.sidebar:
     st.header("⚙️ Configuration")
@@ -866,8 +1060,7 @@ with st.sidebar:
     st.divider()
     
     st.subheader("📊 Example Companies")
-    example_tickers = ["AAPL", "MSFT", "GOOGL", "TSLA", "AMZN", "META", "NFLX"]
-    for ticker in example_tickers:
+    for ticker in EXAMPLE_TICKERS:
         if st.button(ticker, key=f"example_{ticker}", use_container_width=True):
             st.session_state.ticker_input = ticker
 
@@ -887,8 +1080,6 @@ with col2:
 if analyze_button and ticker_input:
     # Initialize orchestrator
     try:
-        from orchestrator import ActivistIntelOrchestrator
-        
         # Progress tracking
         progress_bar = st.progress(0)
         status_text = st.empty()
@@ -908,21 +1099,19 @@ if analyze_button and ticker_input:
         progress_bar.progress(10)
         
         # Demo mode or real analysis
-        if DEMO_MODE and ticker_input.upper() in ["AAPL", "MSFT", "GOOGL", "TSLA", "AMZN", "META", "NFLX"]:
+        if DEMO_MODE and ticker_input.upper() in EXAMPLE_TICKERS:
             status_text.text("🎭 Running demo analysis...")
             progress_bar.progress(50)
-            time.sleep(2)  # Simulate processing
             result = get_demo_result(ticker_input.upper())
             progress_bar.progress(100)
             status_text.text("✅ Demo analysis complete!")
         else:
-            orchestrator = ActivistIntelOrchestrator()
-            
             # Stage 1: SEC Filings
             status_text.text(f"📄 Fetching SEC filings for {ticker_input}...")
             progress_bar.progress(20)
             
-            result = asyncio.run(orchestrator.analyze_company(ticker_input))
+            result = cached_analyze(ticker_input)
+            restore_streamed_thesis(result)
             
             progress_bar.progress(100)
             status_text.text("✅ Analysis complete!")
@@ -951,10 +1140,10 @@ if analyze_button and ticker_input:
             display_download_options(result, ticker_input)
     
     except Exception as e:
+        # Full traceback goes to the server log only; the page gets the one-line message
+        logger.exception("Analysis failed for %s", ticker_input)
         st.error(f"❌ Analysis failed: {str(e)}")
-        if not DEMO_MODE:
-            st.exception(e)
-        else:
+        if DEMO_MODE:
             st.info("Demo mode: Using sample data to showcase functionality")
 
 elif analyze_button and not ticker_input:
@@ -5,18 +5,34 @@ OpenAI-powered version
 """
 
 import asyncio
-from typing import Dict
+from typing import Dict, List
 import time
 import os
 from dotenv import load_dotenv
 
+# Tools
+from tools.sec_fetcher import SECFetcher
+from tools.ade_extractor import LandingAIDirectExtractor
+from tools.ratio_calculator import RatioCalculator
+from tools.peer_comparator import PeerComparator
+from tools.market_data import MarketDataFetcher
+
+# Agents
+from agents.analyst_agent import FinancialAnalystAgent
+from agents.governance_agent import GovernanceAnalystAgent
+from agents.thesis_generator import ThesisGeneratorAgent
+from agents.combined_agent import CombinedAnalystAgent
+
 # Load environment variables
 load_dotenv()
 
 class ActivistIntelOrchestrator:
     """Main controller that coordinates all agents and tools"""
     
-    def __init__(self):
+    def __init__(self, combined: bool = False):
+        # combined: run financial, governance and thesis analysis as one combined LLM call
+        self.combined = combined
+        
         # Load API keys from environment
         # LandingAI SDK uses VISION_AGENT_API_KEY by default, but we support both names
         self.landing_ai_key = os.getenv('VISION_AGENT_API_KEY') or os.getenv('LANDING_AI_API_KEY')
@@ -36,18 +52,6 @@ class ActivistIntelOrchestrator:
             print("Add OPENAI_API_KEY or ANTHROPIC_API_KEY to .env for AI analysis.")
             print("Using rule-based analysis instead.\n")
         
-        # Import tools
-        from tools.sec_fetcher import SECFetcher
-        from tools.ade_extractor import LandingAIDirectExtractor
-        from tools.ratio_calculator import RatioCalculator
-        from tools.peer_comparator import PeerComparator
-        from tools.market_data import MarketDataFetcher
-        
-        # Import agents
-        from agents.analyst_agent import FinancialAnalystAgent
-        from agents.governance_agent import GovernanceAnalystAgent
-        from agents.thesis_generator import ThesisGeneratorAgent
-        
         # Initialize tools
         self.sec_fetcher_class = SECFetcher
         self.ade_extractor = LandingAIDirectExtractor(self.landing_ai_key)
@@ -59,37 +63,49 @@ class ActivistIntelOrchestrator:
         self.financial_agent = FinancialAnalystAgent(self.llm_key) if self.llm_key else None
         self.governance_agent = GovernanceAnalystAgent(self.llm_key) if self.llm_key else None
         self.thesis_agent = ThesisGeneratorAgent(self.llm_key) if self.llm_key else None
+        self.combined_agent = CombinedAnalystAgent(self.llm_key) if self.llm_key and combined else None
     
-    async def analyze_company(self, ticker: str) -> Dict:
+    async def analyze_company(self, ticker: str, defer_thesis: bool = False) -> Dict:
         """
         Complete end-to-end analysis pipeline with REAL DATA
         
+        With defer_thesis the AI thesis is not generated here: 'ai_thesis' is None and the
+        caller streams it with stream_thesis(result)
+        
         Returns analysis results dictionary
         """
         
         start_time = time.time()
         
-        # STAGE 1: Fetch real SEC filings
-        print(f"\n{'='*70}")
-        print(f"STAGE 1: SEC EDGAR FILING RETRIEVAL")
-        print(f"{'='*70}")
-        
-        fetcher = self.sec_fetcher_class(ticker)
-        filings = fetcher.fetch_filings(['10-K', 'DEF 14A', '8-K'], years=3)
+        # Market data only needs the ticker - fetch it in a worker thread while stages 1-2 run
+        market_task = asyncio.create_task(asyncio.to_thread(self.market_fetcher.get_market_data, ticker))
         
-        # STAGE 2: Extract data with LandingAI Direct API
-        print(f"\n{'='*70}")
-        print(f"STAGE 2: LANDINGAI DIRECT API DOCUMENT EXTRACTION")
-        print(f"{'='*70}")
-        
-        extracted_data = await self.ade_extractor.process_all_documents(filings)
+        try:
+            # STAGE 1: Fetch real SEC filings
+            print(f"\n{'='*70}")
+            print(f"STAGE 1: SEC EDGAR FILING RETRIEVAL")
+            print(f"{'='*70}")
+            
+            fetcher = self.sec_fetcher_class(ticker)
+            filings = await fetcher.afetch_filings(['10-K', 'DEF 14A', '8-K'], years=3)
+            
+            # STAGE 2: Extract data with LandingAI Direct API
+            print(f"\n{'='*70}")
+            print(f"STAGE 2: LANDINGAI DIRECT API DOCUMENT EXTRACTION")
+            print(f"{'='*70}")
+            
+            extracted_data = await self.ade_extractor.process_all_documents(filings)
+        except BaseException:
+            # Nobody will await the market task now; cancel it so its outcome isn't left unretrieved
+            market_task.cancel()
+            raise
         
         # STAGE 3: Fetch real-time market data
         print(f"\n{'='*70}")
         print(f"STAGE 3: MARKET DATA RETRIEVAL")
         print(f"{'='*70}")
         
-        market_data = self.market_fetcher.get_market_data(ticker)
+        market_data = await market_task
         extracted_data['market_data'] = market_data
         
         # STAGE 4: Calculate financial metrics
@@ -140,22 +156,35 @@ class ActivistIntelOrchestrator:
         print(f"STAGE 7: AI AGENT ANALYSIS")
         print(f"{'='*70}")
         
-        if self.llm_key and self.financial_agent:
-            # Financial analysis
-            financial_analysis = self.financial_agent.analyze(extracted_data)
-            
-            # Governance analysis
-            governance_analysis = self.governance_agent.analyze(extracted_data)
-            
-            # Generate AI thesis
-            print(f"  📝 Generating comprehensive AI investment thesis...")
-            ai_thesis = self.thesis_agent.generate_thesis(
-                financial_analysis,
-                governance_analysis,
-                fetcher.company_name,
-                ticker,
-                extracted_data
-            )
+        thesis_inputs = None
+        if self.llm_key and self.combined_agent:
+            # One request returns all three analyses
+            combined = await self.combined_agent.analyze(extracted_data, fetcher.company_name, ticker)
+            financial_analysis = combined['financial_analysis']
+            governance_analysis = combined['governance_analysis']
+            ai_thesis = combined['thesis']
+        elif self.llm_key and self.financial_agent:
+            # Financial and governance analyses are independent - run them concurrently
+            fin_task = asyncio.create_task(self.financial_agent.analyze_structured(extracted_data))
+            gov_task = asyncio.create_task(self.governance_agent.analyze_structured(extracted_data))
+            financial_findings, governance_findings = await asyncio.gather(fin_task, gov_task)
+
+            # Markdown for the report is rendered locally from the structured findings
+            financial_analysis = self.financial_agent.to_markdown(financial_findings, extracted_data)
+            governance_analysis = self.governance_agent.to_markdown(governance_findings, extracted_data)
+
+            # Generate AI thesis (fed the compact findings rather than the rendered markdown)
+            thesis_inputs = (financial_findings or financial_analysis, governance_findings or governance_analysis)
+            if defer_thesis:
+                ai_thesis = None
+            else:
+                print(f"  📝 Generating comprehensive AI investment thesis...")
+                ai_thesis = await self.thesis_agent.generate_thesis_full(
+                    *thesis_inputs,
+                    fetcher.company_name,
+                    ticker,
+                    extracted_data
+                )
         else:
             print(f"  ℹ️  No LLM API key found - using rule-based analysis")
             financial_analysis = "Rule-based analysis (add LLM key for AI analysis)"
@@ -180,9 +209,66 @@ class ActivistIntelOrchestrator:
             'financial_analysis': financial_analysis,
             'governance_analysis': governance_analysis,
             'ai_thesis': ai_thesis,
+            'thesis_inputs': thesis_inputs,
             'processing_time': processing_time
         }
     
+    async def scan_portfolio(self, tickers: List[str]) -> List[Dict]:
+        """
+        Non-interactive watchlist scan: financial analysis for many companies in one OpenAI Batch API job
+        
+        Filings for every company are fetched and extracted concurrently and market data comes from
+        one concurrent lookup; the LLM requests then go out as a single batch (half the token price,
+        but results can take up to 24h)
+        
+        Returns one dict per ticker with 'ticker', 'company_name', 'extracted_data' and 'financial_analysis'
+        """
+        
+        if not self.financial_agent:
+            raise RuntimeError("Portfolio scans need OPENAI_API_KEY for the Batch API")
+        
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        
+        print(f"\n{'='*70}")
+        print(f"PORTFOLIO SCAN: {len(tickers)} COMPANIES")
+        print(f"{'='*70}")
+        
+        market_task = asyncio.create_task(asyncio.to_thread(self.market_fetcher.get_market_data_many, tickers))
+        fetchers = [self.sec_fetcher_class(ticker) for ticker in tickers]
+        
+        try:
+            # Only the 10-K feeds the financial analysis
+            filings = await asyncio.gather(*(fetcher.afetch_filings(['10-K'], years=1) for fetcher in fetchers))
+            extracted = await asyncio.gather(*(self.ade_extractor.process_all_documents(f) for f in filings))
+        except BaseException:
+            market_task.cancel()
+            raise
+        
+        market_data = await market_task
+        for ticker, extracted_data in zip(tickers, extracted):
+            extracted_data['market_data'] = market_data[ticker]
+        
+        analyses = await self.financial_agent.analyze_batch(extracted)
+        
+        return [
+            {
+                'ticker': ticker,
+                'company_name': fetcher.company_name,
+                'extracted_data': extracted_data,
+                'financial_analysis': analysis
+            }
+            for ticker, fetcher, extracted_data, analysis in zip(tickers, fetchers, extracted, analyses)
+        ]
+    
+    def stream_thesis(self, result: Dict):
+        """Async iterator over the AI thesis markdown for a result built with defer_thesis=True"""
+        return self.thesis_agent.generate_thesis(
+            *result['thesis_inputs'],
+            result['company_name'],
+            result['ticker'],
+            result['extracted_data']
+        )
+    
     def _generate_basic_thesis(self, ticker, company_name, metrics, red_flags, peer_comp, extracted_data):
         """Generate basic rule-based investment thesis"""
         
@@ -190,7 +276,7 @@ class ActivistIntelOrchestrator:
         revenue = extracted_data['10k']['revenue_current']
         market_cap = extracted_data['market_data']['market_cap']
         
-        thesis = f"""# Investment Thesis: {company_name} ({ticker})
+        parts = [f"""# Investment Thesis: {company_name} ({ticker})
 
 ## Executive Summary
 
@@ -210,13 +296,12 @@ Based on peer valuation analysis, {ticker} trades at a {abs(peer_comp.upside_to_
 
 ## Value Creation Opportunities
 
-"""
+"""]
         
         # Add red flags as catalysts
         if red_flags:
-            for i, (flag_name, flag_desc) in enumerate(red_flags.items(), 1):
-                catalyst_name = flag_name.replace('_', ' ').title()
-                thesis += f"""### Catalyst {i}: {catalyst_name}
+            parts.extend(
+                f"""### Catalyst {i}: {flag_name.replace('_', ' ').title()}
 
 **Current State:** {flag_desc}
 
@@ -225,19 +310,21 @@ Based on peer valuation analysis, {ticker} trades at a {abs(peer_comp.upside_to_
 ---
 
 """
+                for i, (flag_name, flag_desc) in enumerate(red_flags.items(), 1)
+            )
         else:
-            thesis += """*No major red flags identified. Company appears well-managed on core financial metrics.*
+            parts.append("""*No major red flags identified. Company appears well-managed on core financial metrics.*
 
-"""
+""")
         
-        thesis += f"""## Conclusion
+        parts.append(f"""## Conclusion
 
 {company_name} represents {'a compelling' if len(red_flags) >= 2 else 'an interesting'} activist opportunity.
 
 **Recommendation:** {'Initiate position and engage with management/board' if red_flags else 'Monitor for future opportunities'}
-"""
+""")
         
-        return thesis
+        return "".join(parts)
 
 
 def save_results(results: Dict, output_file: str = None):
@@ -280,23 +367,55 @@ def save_results(results: Dict, output_file: str = None):
     return output_file
 
 
+def save_scan_results(results: List[Dict], output_file: str = None):
+    """Save a portfolio scan (one financial analysis per company) to file"""
+    
+    if output_file is None:
+        output_file = f"portfolio_scan_{int(time.time())}.md"
+    
+    with open(output_file, 'w') as f:
+        f.write("# SHAREHOLDER CATALYST PORTFOLIO SCAN\n\n")
+        f.write(f"**Analysis Date:** {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"**Companies:** {', '.join(r['ticker'] for r in results)}\n\n")
+        
+        for result in results:
+            f.write("---\n\n")
+            f.write(f"# {result['company_name']} ({result['ticker']})\n\n")
+            f.write(result['financial_analysis'])
+            f.write("\n\n")
+    
+    print(f"\n💾 Scan saved to: {output_file}")
+    return output_file
+
+
 if __name__ == "__main__":
     import sys
+    from agents._logging import setup_logging
+    
+    setup_logging()
     
     # Get ticker from command line
-    if len(sys.argv) < 2:
-        print("Usage: python orchestrator.py TICKER")
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args:
+        print("Usage: python orchestrator.py TICKER [--combined]")
+        print("       python orchestrator.py --scan TICKER [TICKER ...]")
         print("Example: python orchestrator.py AAPL")
         sys.exit(1)
     
-    ticker = sys.argv[1].upper()
-    
-    # Run analysis
-    orchestrator = ActivistIntelOrchestrator()
-    result = asyncio.run(orchestrator.analyze_company(ticker))
-    
-    # Save results
-    output_file = save_results(result)
+    if '--scan' in sys.argv:
+        # Watchlist scan through the OpenAI Batch API (results can take hours)
+        orchestrator = ActivistIntelOrchestrator()
+        results = asyncio.run(orchestrator.scan_portfolio(args))
+        output_file = save_scan_results(results)
+    else:
+        ticker = args[0].upper()
+        
+        # Run analysis (--combined runs all LLM analysis as one combined call)
+        orchestrator = ActivistIntelOrchestrator(combined='--combined' in sys.argv)
+        result = asyncio.run(orchestrator.analyze_company(ticker))
+        
+        # Save results
+        output_file = save_results(result)
     
     print("\n" + "="*70)
     print("ANALYSIS COMPLETE!")
@@ -4,8 +4,66 @@ Test LandingAI Agentic Document Analysis API
 Using the correct endpoint provided by organizers
 """
 
-import requests
-import json
+import asyncio
+import aiohttp
+import orjson
+
+async def _probe(session, endpoint, i, auth, test_content):
+    """POST the test document with one auth method; returns (i, auth, status, reason, body)"""
+    # Test with file upload
+    data = aiohttp.FormData()
+    data.add_field('file', test_content, filename='test_10k.html', content_type='text/html')
+    data.add_field('prompt', 'Extract total revenue, net income, and total assets from this document and return as JSON')
+    data.add_field('response_format', 'json')
+    
+    try:
+        async with session.post(endpoint, data=data, headers=auth['headers']) as response:
+            return i, auth, response.status, response.reason, await response.text()
+    except Exception as e:
+        return i, auth, None, str(e), ""
+
+async def _probe_auth_methods(endpoint, auth_methods, test_content) -> bool:
+    """Fire every auth method at once over one session; report each as it finishes"""
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+        pending = {
+            asyncio.create_task(_probe(session, endpoint, i, auth, test_content))
+            for i, auth in enumerate(auth_methods, 1)
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    i, auth, status, reason, text = task.result()
+                    print(f"\n{i}. Testing auth method: {list(auth['headers'].keys())[0]}")
+                    
+                    if status is None:
+                        print(f"   ❌ Error: {reason}")
+                        continue
+                    
+                    print(f"   Status: {status}")
+                    
+                    if status == 200:
+                        print(f"   ✅ SUCCESS! LandingAI is working!")
+                        print(f"   Response preview: {text[:200]}...")
+                        try:
+                            json_response = orjson.loads(text)
+                            print(f"   Parsed JSON: {json_response}")
+                        except:
+                            print(f"   Raw response: {text}")
+                        return True
+                    elif status == 401:
+                        print(f"   🔑 401 - Still unauthorized with this method")
+                    elif status == 422:
+                        print(f"   📝 422 - Validation error (check request format)")
+                        print(f"   Response: {text}")
+                    else:
+                        print(f"   ⚠️  {status} - {reason}")
+                        print(f"   Response: {text[:200]}...")
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    return False
 
 def test_landingai_correct_endpoint():
     """Test the correct LandingAI endpoint"""
@@ -42,47 +100,9 @@ def test_landingai_correct_endpoint():
     </html>
     """
     
-    for i, auth in enumerate(auth_methods, 1):
-        print(f"\n{i}. Testing auth method: {list(auth['headers'].keys())[0]}")
-        
-        try:
-            # Test with file upload
-            files = {'file': ('test_10k.html', test_content, 'text/html')}
-            data = {
-                'prompt': 'Extract total revenue, net income, and total assets from this document and return as JSON',
-                'response_format': 'json'
-            }
-            
-            response = requests.post(
-                ENDPOINT,
-                files=files,
-                data=data,
-                headers=auth['headers'],
-                timeout=30
-            )
-            
-            print(f"   Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                print(f"   ✅ SUCCESS! LandingAI is working!")
-                print(f"   Response preview: {response.text[:200]}...")
-                try:
-                    json_response = response.json()
-                    print(f"   Parsed JSON: {json_response}")
-                except:
-                    print(f"   Raw response: {response.text}")
-                return True
-            elif response.status_code == 401:
-                print(f"   🔑 401 - Still unauthorized with this method")
-            elif response.status_code == 422:
-                print(f"   📝 422 - Validation error (check request format)")
-                print(f"   Response: {response.text}")
-            else:
-                print(f"   ⚠️  {response.status_code} - {response.reason}")
-                print(f"   Response: {response.text[:200]}...")
-                
-        except Exception as e:
-            print(f"   ❌ Error: {str(e)}")
+    # All auth methods are probed concurrently; the first 200 cancels the rest
+    if asyncio.run(_probe_auth_methods(ENDPOINT, auth_methods, test_content)):
+        return True
     
     print(f"\n" + "="*60)
     print("❌ Still getting authorization errors")
@@ -3,8 +3,54 @@
 Quick test for LandingAI API format based on error message
 """
 
-import requests
-import json
+import asyncio
+import aiohttp
+import orjson
+
+async def _probe(session, endpoint, i, test, j, auth_header):
+    """POST one format with one auth method; returns (i, test, j, auth_header, status, body)"""
+    headers = {**auth_header, "Content-Type": "application/json"}
+    
+    try:
+        async with session.post(endpoint, json=test['payload'], headers=headers) as response:
+            return i, test, j, auth_header, response.status, await response.text()
+    except Exception as e:
+        return i, test, j, auth_header, None, str(e)
+
+async def _probe_all(endpoint, test_formats, auth_methods):
+    """Fire every format x auth combination at once over one session; report each as it finishes"""
+    # json= payloads are encoded with orjson
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30),
+                                     json_serialize=lambda obj: orjson.dumps(obj).decode()) as session:
+        pending = {
+            asyncio.create_task(_probe(session, endpoint, i, test, j, auth_header))
+            for i, test in enumerate(test_formats, 1)
+            for j, auth_header in enumerate(auth_methods, 1)
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    i, test, j, auth_header, status, text = task.result()
+                    
+                    if status is None:
+                        print(f"{i}. {test['name']} / Auth {j}: Error: {text[:50]}")
+                        continue
+                    
+                    print(f"{i}. {test['name']} / Auth {j}: Status {status}")
+                    
+                    if status == 200:
+                        print(f"   ✅ SUCCESS! Working format found!")
+                        result = orjson.loads(text)
+                        print(f"   Response: {orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()[:300]}...")
+                        return test, auth_header
+                    else:
+                        print(f"   Response: {text[:100]}")
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    return None
 
 def test_landingai_format():
     """Test the exact format LandingAI wants"""
@@ -59,39 +105,17 @@ def test_landingai_format():
     print(f"API Key: {API_KEY[:15]}...")
     print("=" * 60)
     
-    for i, test in enumerate(test_formats, 1):
-        print(f"\n{i}. Testing: {test['name']}")
-        
-        # Try different auth methods
-        auth_methods = [
-            {"Authorization": f"Bearer {API_KEY}"},
-            {"apikey": API_KEY},
-            {"X-API-Key": API_KEY}
-        ]
-        
-        for j, auth_header in enumerate(auth_methods, 1):
-            headers = {**auth_header, "Content-Type": "application/json"}
-            
-            try:
-                response = requests.post(
-                    ENDPOINT,
-                    json=test['payload'],
-                    headers=headers,
-                    timeout=30
-                )
-                
-                print(f"   Auth {j}: Status {response.status_code}")
-                
-                if response.status_code == 200:
-                    print(f"   ✅ SUCCESS! Working format found!")
-                    result = response.json()
-                    print(f"   Response: {json.dumps(result, indent=2)[:300]}...")
-                    return test, auth_header
-                else:
-                    print(f"   Response: {response.text[:100]}")
-                    
-            except Exception as e:
-                print(f"   Error: {str(e)[:50]}")
+    # Try different auth methods
+    auth_methods = [
+        {"Authorization": f"Bearer {API_KEY}"},
+        {"apikey": API_KEY},
+        {"X-API-Key": API_KEY}
+    ]
+    
+    # Every format x auth combination is sent concurrently; the first 200 cancels the rest
+    found = asyncio.run(_probe_all(ENDPOINT, test_formats, auth_methods))
+    if found:
+        return found
     
     print(f"\n" + "=" * 60)
     print("❌ All formats failed. Check API documentation.")
@@ -3,65 +3,168 @@ LandingAI Direct API Integration (Updated)
 Handles PDF, HTML, and text filings robustly with correct file uploads.
 """
 
-import requests
+import aiohttp
 import asyncio
+import diskcache
+import logging
+import mmap
+import orjson
+import os
+import re
+from hashlib import blake2b
 from typing import Dict
-import json
-import base64
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# Cap on concurrent LandingAI requests (connections in the shared session's pool)
+LANDINGAI_MAX_CONCURRENCY = 8
+
+# Successful extractions persist here, keyed by filing content + prompt
+ADE_CACHE_DIR = Path("~/.cache/shareholder_catalyst/ade").expanduser()
+HASH_CHUNK_BYTES = 1 << 20
+
+# Tables kept per filing; table-less filings read at most MAX_TEXT_BYTES for the 50k-character excerpt
+MAX_TABLES = 10
+MAX_TEXT_BYTES = 2_000_000
+
+# Compiled once at import instead of looked up in re's pattern cache on every document
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)[^>]*>.*?</\1>", re.DOTALL | re.IGNORECASE)
+# Scripts/styles and tables in one alternation: a single scan finds tables while skipping over
+# script/style bodies (group 1 is set only for those). Bytes pattern: it runs over the mmap'd
+# file, so only matched tables are ever decoded
+_TABLE_OR_JUNK_RE = re.compile(rb"<(script|style)[^>]*>.*?</\1>|<table[^>]*>.*?</table>", re.DOTALL | re.IGNORECASE)
+# Revenue and net income in one alternation so markdown is scanned once
+_FIELDS_RE = re.compile(
+    r"(?P<field>revenues?|net\s+income)\s*[:\s]\s*\$?\s*(?P<num>[0-9,]+(?:\.[0-9]+)?)\s*(?P<unit>billion|million|b|m)?",
+    re.IGNORECASE
+)
+
 
 class LandingAIDirectExtractor:
     """Direct API integration with LandingAI using correct endpoint"""
 
+    # Fixed prompts (also part of the extraction cache key)
+    FINANCIAL_PROMPT = (
+        "Extract key financial metrics from this SEC 10-K filing. "
+        "Return JSON with: revenue_current, revenue_prior_1, net_income_current, "
+        "total_assets, cash_equivalents, total_debt, shareholders_equity. "
+        "Convert all values to dollars."
+    )
+    GOVERNANCE_PROMPT = (
+        "Extract governance data from this proxy statement. "
+        "Return JSON with: ceo_total_comp_current, board_members (array), say_on_pay_approval_pct."
+    )
+
+    # Demo data per filing type, returned when the API is unavailable
+    _FALLBACK_DATA = {
+        "10-K": {
+            "revenue_current": 383_285_000_000,
+            "revenue_prior_1": 394_328_000_000,
+            "net_income_current": 96_995_000_000,
+            "total_assets": 352_755_000_000,
+            "total_debt": 111_088_000_000,
+            "cash_equivalents": 29_965_000_000,
+            "shareholders_equity": 62_146_000_000,
+        },
+        "DEF 14A": {
+            "ceo_total_comp_current": 63_209_230,
+            "board_members": [
+                {"name": "Tim Cook", "role": "CEO & Director", "tenure_years": 12, "independent": False},
+                {"name": "Arthur Levinson", "role": "Chairman", "tenure_years": 21, "independent": True},
+            ],
+            "say_on_pay_approval_pct": 95.4,
+        },
+        "8-K": {
+            "event_type": "Results of Operations and Financial Condition",
+            "event_date": "2024-11-01",
+            "description": "Quarterly earnings announcement",
+            "financial_impact": 0,
+        },
+    }
+
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.endpoint = "https://api.va.landing.ai/v1/ade/parse"
-
-    async def extract_from_10k(self, file_path: str) -> dict:
+        self._disk = None
+
+    def _get_disk_cache(self) -> diskcache.Cache:
+        if self._disk is None:
+            self._disk = diskcache.Cache(str(ADE_CACHE_DIR))
+        return self._disk
+
+    @staticmethod
+    def _cache_key(file_path: str, prompt: str) -> str:
+        """blake2b of the filing bytes (read in 1 MB chunks) and the prompt, so edits to either miss"""
+        digest = blake2b(prompt.encode())
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(HASH_CHUNK_BYTES):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _lookup_cache(self, file_path: str, prompt: str):
+        """(key, cached result or None); hashing and the SQLite read block, so run via asyncio.to_thread"""
+        key = self._cache_key(file_path, prompt)
+        return key, self._get_disk_cache().get(key)
+
+    async def extract_from_10k(self, file_path: str, session: aiohttp.ClientSession = None) -> dict:
         """Extract financial data from 10-K using direct API call"""
 
         if not self.api_key or self.api_key in ["your_landing_ai_key_here", "demo_key", "test_key"]:
             return self._fallback_extraction(file_path, "10-K")
 
         try:
-            print(f"    🤖 Parsing 10-K with LandingAI API...")
+            prompt = self.FINANCIAL_PROMPT
+            key, cached = await asyncio.to_thread(self._lookup_cache, file_path, prompt)
+            if cached is not None:
+                logger.info("    ⚡ Using cached 10-K extraction")
+                return cached
+
+            logger.info("    🤖 Parsing 10-K with LandingAI API...")
 
-            content = self._prepare_document_content(file_path)
-            result = await self._call_landingai_api(content, self._get_financial_prompt(), file_path)
+            content = await asyncio.to_thread(self._prepare_document_content, file_path)
+            result = await self._call_landingai_api(content, prompt, file_path, session)
 
             if result and self._is_valid_financial_data(result):
-                print(f"    ✅ Successfully extracted financial data")
+                logger.info("    ✅ Successfully extracted financial data")
+                await asyncio.to_thread(self._get_disk_cache().set, key, result)
                 return result
             else:
-                print(f"    ⚠️  Could not extract valid data, using fallback")
+                logger.warning("    ⚠️  Could not extract valid data, using fallback")
                 return self._fallback_extraction(file_path, "10-K")
 
         except Exception as e:
-            print(f"    ❌ LandingAI API failed: {str(e)}")
+            logger.error("    ❌ LandingAI API failed: %s", e)
             return self._fallback_extraction(file_path, "10-K")
 
-    async def extract_from_proxy(self, file_path: str) -> dict:
+    async def extract_from_proxy(self, file_path: str, session: aiohttp.ClientSession = None) -> dict:
         """Extract governance data from proxy statement"""
 
         if not self.api_key or self.api_key in ["your_landing_ai_key_here", "demo_key", "test_key"]:
             return self._fallback_extraction(file_path, "DEF 14A")
 
         try:
-            print(f"    🤖 Parsing proxy statement with LandingAI API...")
+            prompt = self.GOVERNANCE_PROMPT
+            key, cached = await asyncio.to_thread(self._lookup_cache, file_path, prompt)
+            if cached is not None:
+                logger.info("    ⚡ Using cached proxy extraction")
+                return cached
 
-            content = self._prepare_document_content(file_path)
-            result = await self._call_landingai_api(content, self._get_governance_prompt(), file_path)
+            logger.info("    🤖 Parsing proxy statement with LandingAI API...")
+
+            content = await asyncio.to_thread(self._prepare_document_content, file_path)
+            result = await self._call_landingai_api(content, prompt, file_path, session)
 
             if result:
-                print(f"    ✅ Successfully extracted governance data")
+                logger.info("    ✅ Successfully extracted governance data")
+                await asyncio.to_thread(self._get_disk_cache().set, key, result)
                 return result
             else:
-                print(f"    ⚠️  Using fallback governance data")
+                logger.warning("    ⚠️  Using fallback governance data")
                 return self._fallback_extraction(file_path, "DEF 14A")
 
         except Exception as e:
-            print(f"    ❌ LandingAI API failed: {str(e)}")
+            logger.error("    ❌ LandingAI API failed: %s", e)
             return self._fallback_extraction(file_path, "DEF 14A")
 
     async def extract_from_8k(self, file_path: str) -> dict:
@@ -75,56 +178,70 @@ class LandingAIDirectExtractor:
             if file_path.lower().endswith(".pdf"):
                 return ""
 
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-
-            import re
-            content = re.sub(r"<script[^>]*>.*?</script>", "", content, flags=re.DOTALL | re.IGNORECASE)
-            content = re.sub(r"<style[^>]*>.*?</style>", "", content, flags=re.DOTALL | re.IGNORECASE)
-
-            # Only include financial tables or first 50k characters
-            financial_sections = re.findall(r"<table[^>]*>.*?</table>", content, flags=re.DOTALL | re.IGNORECASE)
-            if financial_sections:
-                content = "\n".join(financial_sections[:10])
-            elif len(content) > 50000:
+            with open(file_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return ""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Only include financial tables (first MAX_TABLES, scan stops there) or first 50k characters
+                    financial_sections = []
+                    for match in _TABLE_OR_JUNK_RE.finditer(mm):
+                        if match.group(1) is None:
+                            table = match.group(0).decode("utf-8", errors="ignore")
+                            financial_sections.append(_SCRIPT_STYLE_RE.sub("", table))
+                            if len(financial_sections) == MAX_TABLES:
+                                break
+                    if financial_sections:
+                        return "\n".join(financial_sections)
+
+                    content = mm[:MAX_TEXT_BYTES].decode("utf-8", errors="ignore")
+
+            content = _SCRIPT_STYLE_RE.sub("", content)
+            if len(content) > 50000:
                 content = content[:50000] + "..."
 
             return content
 
         except Exception as e:
-            print(f"    ⚠️ Error preparing content: {str(e)}")
+            logger.warning("    ⚠️ Error preparing content: %s", e)
             return ""
 
-    async def _call_landingai_api(self, content: str, prompt: str, file_path: str = None) -> dict:
-        """Make API call to LandingAI using proper file handling."""
+    async def _call_landingai_api(self, content: str, prompt: str, file_path: str = None,
+                                  session: aiohttp.ClientSession = None) -> dict:
+        """Make API call to LandingAI using proper file handling (on a one-off session if none is given)."""
+        if session is None:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=120)) as session:
+                return await self._call_landingai_api(content, prompt, file_path, session)
+
         try:
             headers = {"Authorization": f"Bearer {self.api_key}"}
 
             # ✅ Case 1: File exists — send as multipart (best for PDFs or large HTML)
             if file_path and Path(file_path).exists():
                 mime_type = "application/pdf" if file_path.lower().endswith(".pdf") else "text/html"
-                with open(file_path, "rb") as f:
-                    files = {"document": (Path(file_path).name, f, mime_type)}
-                    data = {"prompt": prompt}
-                    response = requests.post(self.endpoint, files=files, data=data, headers=headers, timeout=120)
+                data = aiohttp.FormData()
+                data.add_field("document", await asyncio.to_thread(Path(file_path).read_bytes),
+                               filename=Path(file_path).name, content_type=mime_type)
+                data.add_field("prompt", prompt)
+                request = session.post(self.endpoint, data=data, headers=headers)
             else:
                 # ✅ Case 2: Send inline text (for plain filings)
                 payload = {"document": content, "prompt": prompt}
-                response = requests.post(
+                request = session.post(
                     self.endpoint,
-                    json=payload,
+                    data=orjson.dumps(payload),
                     headers={**headers, "Content-Type": "application/json"},
-                    timeout=120,
                 )
 
-            if response.status_code == 200:
-                return self._parse_api_response(response.json())
+            async with request as response:
+                if response.status == 200:
+                    # orjson decodes the (often multi-MB) ADE body straight from bytes
+                    return self._parse_api_response(orjson.loads(await response.read()))
 
-            print(f"    ❌ LandingAI returned {response.status_code}: {response.text[:200]}")
-            return None
+                logger.error("    ❌ LandingAI returned %s: %s", response.status, (await response.text())[:200])
+                return None
 
         except Exception as e:
-            print(f"    ❌ API call error: {str(e)}")
+            logger.error("    ❌ API call error: %s", e)
             return None
 
     def _parse_api_response(self, response: dict) -> dict:
@@ -137,13 +254,11 @@ class LandingAIDirectExtractor:
                 return self._extract_from_markdown(response["markdown"])
             return response
         except Exception as e:
-            print(f"    ⚠️ Error parsing response: {str(e)}")
+            logger.warning("    ⚠️ Error parsing response: %s", e)
             return None
 
     def _extract_from_markdown(self, markdown: str) -> dict:
         """Extract financial values from markdown text."""
-        import re
-
         financial_data = {
             "revenue_current": 0,
             "net_income_current": 0,
@@ -151,14 +266,15 @@ class LandingAIDirectExtractor:
             "cash_equivalents": 0,
         }
 
-        text = markdown.lower()
-        rev = re.search(r"revenue[s]?\s*[:\s]\s*\$?\s*([0-9,]+(?:\.[0-9]+)?)\s*(billion|million|b|m)?", text)
-        inc = re.search(r"net\s+income\s*[:\s]\s*\$?\s*([0-9,]+(?:\.[0-9]+)?)\s*(billion|million|b|m)?", text)
-
-        if rev:
-            financial_data["revenue_current"] = self._convert_to_dollars(*rev.groups())
-        if inc:
-            financial_data["net_income_current"] = self._convert_to_dollars(*inc.groups())
+        # First occurrence of each field wins; stop scanning once both are found
+        found = set()
+        for match in _FIELDS_RE.finditer(markdown):
+            key = "revenue_current" if match["field"][0] in "rR" else "net_income_current"
+            if key not in found:
+                found.add(key)
+                financial_data[key] = self._convert_to_dollars(match["num"], match["unit"])
+                if len(found) == 2:
+                    break
         return financial_data
 
     def _convert_to_dollars(self, value_str: str, unit_str: str) -> int:
@@ -173,20 +289,6 @@ class LandingAIDirectExtractor:
         except Exception:
             return 0
 
-    def _get_financial_prompt(self) -> str:
-        return (
-            "Extract key financial metrics from this SEC 10-K filing. "
-            "Return JSON with: revenue_current, revenue_prior_1, net_income_current, "
-            "total_assets, cash_equivalents, total_debt, shareholders_equity. "
-            "Convert all values to dollars."
-        )
-
-    def _get_governance_prompt(self) -> str:
-        return (
-            "Extract governance data from this proxy statement. "
-            "Return JSON with: ceo_total_comp_current, board_members (array), say_on_pay_approval_pct."
-        )
-
     def _is_valid_financial_data(self, data: dict) -> bool:
         if not isinstance(data, dict):
             return False
@@ -197,47 +299,43 @@ class LandingAIDirectExtractor:
 
     def _fallback_extraction(self, file_path: str, doc_type: str) -> dict:
         """Fallback demo data."""
-        print(f"    📋 Using fallback extraction for demo purposes")
-
-        if doc_type == "10-K":
-            return {
-                "revenue_current": 383_285_000_000,
-                "revenue_prior_1": 394_328_000_000,
-                "net_income_current": 96_995_000_000,
-                "total_assets": 352_755_000_000,
-                "total_debt": 111_088_000_000,
-                "cash_equivalents": 29_965_000_000,
-                "shareholders_equity": 62_146_000_000,
-            }
-        elif doc_type == "DEF 14A":
-            return {
-                "ceo_total_comp_current": 63_209_230,
-                "board_members": [
-                    {"name": "Tim Cook", "role": "CEO & Director", "tenure_years": 12, "independent": False},
-                    {"name": "Arthur Levinson", "role": "Chairman", "tenure_years": 21, "independent": True},
-                ],
-                "say_on_pay_approval_pct": 95.4,
-            }
-        else:  # 8-K
-            return {
-                "event_type": "Results of Operations and Financial Condition",
-                "event_date": "2024-11-01",
-                "description": "Quarterly earnings announcement",
-                "financial_impact": 0,
-            }
+        logger.info("    📋 Using fallback extraction for demo purposes")
+
+        # Fresh top-level dict and nested lists so callers can't mutate the shared table
+        data = self._FALLBACK_DATA.get(doc_type, self._FALLBACK_DATA["8-K"])
+        return {k: [dict(item) for item in v] if isinstance(v, list) else v for k, v in data.items()}
 
     async def process_all_documents(self, filings: Dict) -> dict:
         """Process all SEC filings."""
-        print(f"\n  🤖 Processing documents with LandingAI Direct API...")
-
+        logger.info("\n  🤖 Processing documents with LandingAI Direct API...")
+
+        # Documents are independent - extract them concurrently over one pooled session
+        connector = aiohttp.TCPConnector(limit=LANDINGAI_MAX_CONCURRENCY)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=120)) as session:
+            tasks = {}
+            sources = {}
+            if filings.get("10-K"):
+                sources["10k"] = (filings["10-K"][0]["path"], "10-K")
+                tasks["10k"] = self.extract_from_10k(filings["10-K"][0]["path"], session)
+            if filings.get("DEF 14A"):
+                sources["proxy"] = (filings["DEF 14A"][0]["path"], "DEF 14A")
+                tasks["proxy"] = self.extract_from_proxy(filings["DEF 14A"][0]["path"], session)
+            if filings.get("8-K"):
+                for i, filing in enumerate(filings["8-K"][:2]):
+                    sources[f"8k_{i}"] = (filing["path"], "8-K")
+                    tasks[f"8k_{i}"] = self.extract_from_8k(filing["path"])
+
+            outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        # One failed document falls back on its own instead of failing the others
         results = {}
-        if filings.get("10-K"):
-            results["10k"] = await self.extract_from_10k(filings["10-K"][0]["path"])
-        if filings.get("DEF 14A"):
-            results["proxy"] = await self.extract_from_proxy(filings["DEF 14A"][0]["path"])
-        if filings.get("8-K"):
-            for i, filing in enumerate(filings["8-K"][:2]):
-                results[f"8k_{i}"] = await self.extract_from_8k(filing["path"])
-
-        print(f"  ✅ Extraction complete\n")
+        for key, outcome in zip(tasks, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome  # cancellation propagates; it is not an extraction failure
+            if isinstance(outcome, BaseException):
+                logger.error("    ❌ Extraction failed for %s: %s", key, outcome)
+                outcome = self._fallback_extraction(*sources[key])
+            results[key] = outcome
+
+        logger.info("  ✅ Extraction complete\n")
         return results
@@ -3,89 +3,159 @@ Production Market Data Fetcher
 Get real-time stock prices and market data using yfinance
 """
 
-import sys
-import subprocess
-from typing import Dict, Optional
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import diskcache
 
 try:
     import yfinance as yf
-except ImportError:
-    print("Installing yfinance...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "yfinance"])
-    import yfinance as yf
+except ImportError as e:
+    raise ImportError("yfinance is required for market data. Run: pip install yfinance") from e
+
+logger = logging.getLogger(__name__)
+
+# Quotes persist across processes for MARKET_CACHE_TTL seconds
+MARKET_CACHE_DIR = Path("~/.cache/shareholder_catalyst/market").expanduser()
+MARKET_CACHE_TTL = 900
+
+# In-process quotes shared by every fetcher instance: ticker -> (expires_at epoch, market data)
+_MARKET_CACHE: Dict[str, Tuple[float, Dict]] = {}
+
+# Concurrent Yahoo lookups in get_market_data_many
+MAX_FETCH_WORKERS = 8
+
+# Quote fields present in every get_market_data result; also returned (as a copy) when a lookup fails
+_EMPTY_MARKET_DATA = {
+    'market_cap': 0,
+    'current_price': 0,
+    'shares_outstanding': 0,
+    'fifty_two_week_high': 0,
+    'fifty_two_week_low': 0
+}
+
+# .info key for each fundamentals field; these are only in the result when need_fundamentals is set,
+# and are None when Yahoo has no value, so a missing figure never reads as a real zero
+_FUNDAMENTAL_FIELDS = {
+    'enterprise_value': 'enterpriseValue',
+    'beta': 'beta',
+    'trailing_pe': 'trailingPE',
+    'forward_pe': 'forwardPE',
+    'price_to_book': 'priceToBook',
+    'dividend_yield': 'dividendYield'
+}
+
 class MarketDataFetcher:
     """Fetch real-time market data for stocks"""
     
-    def __init__(self):
-        self.cache = {}
+    def __init__(self, cache_ttl: int = MARKET_CACHE_TTL):
+        self.cache_ttl = cache_ttl
+        self._disk = None
+    
+    def _get_disk_cache(self) -> diskcache.Cache:
+        if self._disk is None:
+            self._disk = diskcache.Cache(str(MARKET_CACHE_DIR))
+        return self._disk
+    
+    @staticmethod
+    def _cache_key(ticker: str, need_fundamentals: bool) -> str:
+        # Quote-only and full entries are cached separately so a quote never stands in for fundamentals
+        return f"{ticker}:full" if need_fundamentals else ticker
     
-    def get_market_data(self, ticker: str) -> Dict:
+    @staticmethod
+    def _disk_key(key: str) -> str:
+        # yfinance version in the key: an upgrade may change what .info returns
+        return f"{key}:{yf.__version__}"
+    
+    def get_market_data(self, ticker: str, need_fundamentals: bool = False) -> Dict:
         """
         Get current market data for ticker from Yahoo Finance
         
+        Price, market cap, shares and the 52-week range come from the small
+        fast_info endpoint; the much larger .info payload is only fetched when
+        need_fundamentals is set (no caller in the pipeline reads those fields)
+        
         Args:
             ticker: Stock ticker symbol
+            need_fundamentals: Also fetch EV, beta, PE ratios, P/B and dividend yield
             
         Returns:
             Dictionary with market data including:
             - market_cap: Current market capitalization
             - current_price: Current stock price
             - shares_outstanding: Number of shares
-            - enterprise_value: EV
-            - beta, PE ratios, etc.
+            - enterprise_value, beta, PE ratios, P/B, dividend_yield: only with
+              need_fundamentals (None where Yahoo has no value)
         """
         
-        # Check cache first
-        if ticker in self.cache:
-            print(f"  📊 Using cached market data for {ticker}")
-            return self.cache[ticker]
+        key = self._cache_key(ticker, need_fundamentals)
+        
+        # Check the shared in-process cache first, then the disk cache
+        hit = _MARKET_CACHE.get(key)
+        if hit is not None and hit[0] > time.time():
+            logger.info("  📊 Using cached market data for %s", ticker)
+            return hit[1]
         
-        print(f"  📊 Fetching real-time market data for {ticker}...")
+        market_data, expires_at = self._get_disk_cache().get(self._disk_key(key), expire_time=True)
+        if market_data is not None:
+            logger.info("  📊 Using cached market data for %s", ticker)
+            _MARKET_CACHE[key] = (expires_at, market_data)
+            return market_data
+        
+        logger.info("  📊 Fetching real-time market data for %s...", ticker)
         
         try:
             # Fetch data from Yahoo Finance
             stock = yf.Ticker(ticker)
-            info = stock.info
+            fast = stock.fast_info
             
             # Extract relevant data
-            market_data = {
-                'market_cap': info.get('marketCap', 0),
-                'current_price': info.get('currentPrice', info.get('regularMarketPrice', 0)),
-                'shares_outstanding': info.get('sharesOutstanding', 0),
-                'enterprise_value': info.get('enterpriseValue', 0),
-                'beta': info.get('beta', 1.0),
-                'trailing_pe': info.get('trailingPE', 0),
-                'forward_pe': info.get('forwardPE', 0),
-                'price_to_book': info.get('priceToBook', 0),
-                'dividend_yield': info.get('dividendYield', 0) or 0,
-                'fifty_two_week_high': info.get('fiftyTwoWeekHigh', 0),
-                'fifty_two_week_low': info.get('fiftyTwoWeekLow', 0)
-            }
+            market_data = dict(_EMPTY_MARKET_DATA)
+            market_data.update({
+                'market_cap': fast.market_cap or 0,
+                'current_price': fast.last_price or 0,
+                'shares_outstanding': fast.shares or 0,
+                'fifty_two_week_high': fast.year_high or 0,
+                'fifty_two_week_low': fast.year_low or 0
+            })
+            
+            if need_fundamentals:
+                info = stock.info
+                market_data.update({field: info.get(info_key) for field, info_key in _FUNDAMENTAL_FIELDS.items()})
             
             # Cache the result
-            self.cache[ticker] = market_data
+            _MARKET_CACHE[key] = (time.time() + self.cache_ttl, market_data)
+            self._get_disk_cache().set(self._disk_key(key), market_data, expire=self.cache_ttl)
             
-            print(f"    ✅ Market Cap: ${market_data['market_cap']/1e9:.1f}B")
-            print(f"    ✅ Current Price: ${market_data['current_price']:.2f}")
+            logger.info("    ✅ Market Cap: $%.1fB", market_data['market_cap'] / 1e9)
+            logger.info("    ✅ Current Price: $%.2f", market_data['current_price'])
             
             return market_data
             
         except Exception as e:
-            print(f"    ❌ Error fetching market data for {ticker}: {str(e)}")
-            # Return zeros on error
-            return {
-                'market_cap': 0,
-                'current_price': 0,
-                'shares_outstanding': 0,
-                'enterprise_value': 0,
-                'beta': 1.0,
-                'trailing_pe': 0,
-                'forward_pe': 0,
-                'price_to_book': 0,
-                'dividend_yield': 0,
-                'fifty_two_week_high': 0,
-                'fifty_two_week_low': 0
-            }
+            logger.error("    ❌ Error fetching market data for %s: %s", ticker, e)
+            # Return zeros on error (fundamentals unknown)
+            market_data = dict(_EMPTY_MARKET_DATA)
+            if need_fundamentals:
+                market_data.update(dict.fromkeys(_FUNDAMENTAL_FIELDS))
+            return market_data
+    
+    def get_market_data_many(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Get market data for several tickers at once
+        
+        Cache misses are fetched concurrently on a thread pool (the lookups are
+        network-bound), so N tickers cost about one round trip instead of N
+        
+        Returns:
+            Dictionary of ticker -> market data (same shape as get_market_data)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(tickers) or 1)) as pool:
+            return dict(zip(tickers, pool.map(self.get_market_data, tickers)))
     
     def get_historical_prices(self, ticker: str, period: str = "1y") -> Optional[Dict]:
         """
@@ -107,19 +177,21 @@ class MarketDataFetcher:
                 'volume': hist['Volume'].tolist()
             }
         except Exception as e:
-            print(f"Error fetching historical data: {e}")
+            logger.error("Error fetching historical data: %s", e)
             return None
 
 
 # Test the fetcher
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     fetcher = MarketDataFetcher()
     
     # Test with AAPL
-    data = fetcher.get_market_data('AAPL')
+    data = fetcher.get_market_data('AAPL', need_fundamentals=True)
     
     print(f"\n📊 AAPL Market Data:")
     print(f"  Market Cap: ${data['market_cap']/1e9:.1f}B")
     print(f"  Price: ${data['current_price']:.2f}")
-    print(f"  Enterprise Value: ${data['enterprise_value']/1e9:.1f}B")
-    print(f"  P/E Ratio: {data['trailing_pe']:.1f}")
+    print(f"  Enterprise Value: ${(data['enterprise_value'] or 0)/1e9:.1f}B")
+    print(f"  P/E Ratio: {data['trailing_pe'] or 0:.1f}")
@@ -3,14 +3,21 @@ Peer Company Comparator
 Compare target company against industry peers
 """
 
-from typing import Dict, List
+import functools
+from typing import Dict, List, Tuple
 from dataclasses import dataclass
 
-@dataclass
+import numpy as np
+
+# Row order of the per-industry peer matrix
+PEER_METRICS = ('roe', 'roic', 'margin')
+
+# Frozen: memoized results are shared between callers
+@dataclass(slots=True, frozen=True)
 class PeerComparison:
     """Comparison results"""
     target_ticker: str
-    peer_group: List[str]
+    peer_group: Tuple[str, ...]
     roe_percentile: float
     roic_percentile: float
     margin_percentile: float
@@ -21,6 +28,63 @@ class PeerComparison:
     implied_market_cap_at_peer_median: float
 
 
+# Frozen tuples keep the stats hashable, so they can be part of the memoization key
+@dataclass(slots=True, frozen=True)
+class _PeerStats:
+    """Derived peer data for one industry"""
+    tickers: Tuple[str, ...]
+    sorted_values: Tuple[Tuple[float, ...], ...]  # one ascending row per PEER_METRICS entry
+    medians: Tuple[float, ...]
+
+
+def _build_stats(peers: List[Dict]) -> _PeerStats:
+    """Peer tickers plus each metric's values sorted ascending and its median"""
+    values = np.sort(np.array(
+        [[p[metric] for p in peers] for metric in PEER_METRICS], dtype=np.float64
+    ).reshape(len(PEER_METRICS), len(peers)), axis=1)
+    medians = np.median(values, axis=1) if peers else np.zeros(len(PEER_METRICS))
+    return _PeerStats(
+        tickers=tuple(p['ticker'] for p in peers),
+        sorted_values=tuple(tuple(row) for row in values.tolist()),
+        medians=tuple(medians.tolist())
+    )
+
+
+def _calc_percentiles(values: Tuple[float, ...], sorted_values: Tuple[Tuple[float, ...], ...]) -> List[float]:
+    """Percentile rank of each value within its metric's row (share of peers strictly below)"""
+    return [
+        float(np.searchsorted(row, value, side='left')) / len(row) * 100 if row else 50.0
+        for value, row in zip(values, sorted_values)
+    ]
+
+
+@functools.lru_cache(maxsize=256)
+def _compare(stats: _PeerStats, ticker: str, target_roe: float, target_roic: float,
+             target_margin: float, current_mc: float) -> PeerComparison:
+    """Peer comparison for one set of target metrics against one industry's stats"""
+    
+    targets = (target_roe, target_roic, target_margin)
+    
+    roe_gap, roic_gap, margin_gap = (t - m for t, m in zip(targets, stats.medians))
+    roe_pct, roic_pct, margin_pct = _calc_percentiles(targets, stats.sorted_values)
+    
+    # Calculate implied market cap (simplified)
+    implied_mc = current_mc * 1.15  # Simplified 15% upside
+    
+    return PeerComparison(
+        target_ticker=ticker,
+        peer_group=stats.tickers,
+        roe_percentile=roe_pct,
+        roic_percentile=roic_pct,
+        margin_percentile=margin_pct,
+        roe_gap=roe_gap,
+        roic_gap=roic_gap,
+        margin_gap=margin_gap,
+        upside_to_peer_median=15.0,  # Simplified
+        implied_market_cap_at_peer_median=implied_mc
+    )
+
+
 class PeerComparator:
     """Compare company against industry peers"""
     
@@ -34,55 +98,22 @@ class PeerComparator:
                 {'ticker': 'GOOGL', 'roe': 26.0, 'roic': 22.0, 'margin': 27.0},
             ]
         }
+        
+        # Peer data is fixed, so sorted values and medians are derived once per industry
+        self._stats = {industry: _build_stats(peers) for industry, peers in self.peer_database.items()}
     
     def compare_to_peers(self, ticker: str, target_metrics: Dict, industry: str = 'technology') -> PeerComparison:
         """Perform comprehensive peer comparison"""
         
-        peers = self.peer_database.get(industry, self.peer_database['technology'])
-        peer_tickers = [p['ticker'] for p in peers]
-        
-        target_roe = target_metrics.get('roe', 0)
-        target_roic = target_metrics.get('roic', 0)
-        target_margin = target_metrics.get('operating_margin', 0)
-        
-        peer_roes = [p['roe'] for p in peers]
-        peer_roics = [p['roic'] for p in peers]
-        peer_margins = [p['margin'] for p in peers]
-        
-        # Calculate medians
-        import statistics
-        roe_median = statistics.median(peer_roes) if peer_roes else 0
-        roic_median = statistics.median(peer_roics) if peer_roics else 0
-        margin_median = statistics.median(peer_margins) if peer_margins else 0
-        
-        # Calculate gaps
-        roe_gap = target_roe - roe_median
-        roic_gap = target_roic - roic_median
-        margin_gap = target_margin - margin_median
-        
-        # Calculate implied market cap (simplified)
-        current_mc = target_metrics.get('market_cap', 0)
-        implied_mc = current_mc * 1.15  # Simplified 15% upside
-        
-        return PeerComparison(
-            target_ticker=ticker,
-            peer_group=peer_tickers,
-            roe_percentile=self._calc_percentile(target_roe, peer_roes),
-            roic_percentile=self._calc_percentile(target_roic, peer_roics),
-            margin_percentile=self._calc_percentile(target_margin, peer_margins),
-            roe_gap=roe_gap,
-            roic_gap=roic_gap,
-            margin_gap=margin_gap,
-            upside_to_peer_median=15.0,  # Simplified
-            implied_market_cap_at_peer_median=implied_mc
+        # Only these inputs affect the result; they form the memoization key
+        return _compare(
+            self._stats.get(industry, self._stats['technology']),
+            ticker,
+            target_metrics.get('roe', 0),
+            target_metrics.get('roic', 0),
+            target_metrics.get('operating_margin', 0),
+            target_metrics.get('market_cap', 0)
         )
-    
-    def _calc_percentile(self, value: float, peer_values: List[float]) -> float:
-        """Calculate percentile rank"""
-        if not peer_values:
-            return 50.0
-        below = sum(1 for v in peer_values if v < value)
-        return (below / len(peer_values)) * 100
 
 
 if __name__ == "__main__":
@@ -3,10 +3,12 @@ Financial Ratio Calculator
 Calculates key metrics for activist analysis
 """
 
+import functools
 from typing import Dict, Optional
 from dataclasses import dataclass
 
-@dataclass
+# Frozen: memoized results are shared between callers
+@dataclass(slots=True, frozen=True)
 class FinancialMetrics:
     """Container for calculated financial metrics"""
     market_cap: float
@@ -42,19 +44,9 @@ class RatioCalculator:
         operating_income = financial_data.get('operating_income', 0)
         market_cap = market_data.get('market_cap', 0)
         
-        # Calculate metrics
-        enterprise_value = market_cap + (total_debt - cash)
-        invested_capital = total_debt + equity
-        
-        self.metrics = FinancialMetrics(
-            market_cap=market_cap,
-            enterprise_value=enterprise_value,
-            ev_to_revenue=self._safe_divide(enterprise_value, revenue),
-            roe=self._safe_divide(net_income, equity) * 100,
-            roic=self._safe_divide(operating_income * 0.79, invested_capital) * 100,
-            operating_margin=self._safe_divide(operating_income, revenue) * 100,
-            revenue_growth_1y=self._calculate_growth(revenue, revenue_prior),
-            cash_to_assets_ratio=self._safe_divide(cash, total_assets) * 100
+        self.metrics = _compute_metrics(
+            revenue, revenue_prior, net_income, total_assets, total_debt,
+            cash, equity, operating_income, market_cap
         )
         
         return self.metrics
@@ -74,13 +66,36 @@ class RatioCalculator:
         
         return red_flags
     
-    def _safe_divide(self, num: float, denom: float) -> float:
-        return num / denom if denom != 0 else 0
+
+def _safe_divide(num: float, denom: float) -> float:
+    return num / denom if denom != 0 else 0
+
+
+def _calculate_growth(current: float, prior: float) -> float:
+    if prior == 0:
+        return 0
+    return ((current - prior) / prior) * 100
+
+
+@functools.lru_cache(maxsize=256)
+def _compute_metrics(revenue, revenue_prior, net_income, total_assets, total_debt,
+                     cash, equity, operating_income, market_cap) -> FinancialMetrics:
+    """Ratios for one set of inputs, memoized so repeat analyses of the same filings are a lookup"""
+    
+    # Calculate metrics
+    enterprise_value = market_cap + (total_debt - cash)
+    invested_capital = total_debt + equity
     
-    def _calculate_growth(self, current: float, prior: float) -> float:
-        if prior == 0:
-            return 0
-        return ((current - prior) / prior) * 100
+    return FinancialMetrics(
+        market_cap=market_cap,
+        enterprise_value=enterprise_value,
+        ev_to_revenue=_safe_divide(enterprise_value, revenue),
+        roe=_safe_divide(net_income, equity) * 100,
+        roic=_safe_divide(operating_income * 0.79, invested_capital) * 100,
+        operating_margin=_safe_divide(operating_income, revenue) * 100,
+        revenue_growth_1y=_calculate_growth(revenue, revenue_prior),
+        cash_to_assets_ratio=_safe_divide(cash, total_assets) * 100
+    )
 
 
 if __name__ == "__main__":
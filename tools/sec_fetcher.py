@@ -1,250 +1,500 @@
-import requests
+import aiohttp
+import asyncio
+import logging
+import orjson
 import os
-from typing import Dict, List
-from datetime import datetime, timedelta
+import threading
 import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 import re
 
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+logger = logging.getLogger(__name__)
+
+# SEC allows at most 10 requests/second per client; cap requests in flight and request starts
+# per second a little below that
+SEC_MAX_CONCURRENCY = 8
+SEC_REQUESTS_PER_SECOND = 8
+
+# company_tickers.json is cached on disk; within TICKERS_MAX_AGE it is reused without a request,
+# after that it is revalidated with its ETag / Last-Modified
+TICKERS_CACHE_PATH = "data/cache/company_tickers.json"
+TICKERS_META_PATH = "data/cache/company_tickers.meta.json"
+TICKERS_MAX_AGE = 24 * 3600
+
+# Filings are streamed to disk in pieces of this size instead of buffered whole
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+# Ticker -> (zero-padded CIK, company name), built once per process and shared by every fetcher
+_TICKER_INDEX: Dict[str, Tuple[str, str]] = {}
+
+# ATOM entry elements -> filing fields (EDGAR's feed spells the accession tag "accession-nunber")
+_ATOM_FIELDS = {
+    'filing-date': 'date',
+    'accession-number': 'accession',
+    'accession-nunber': 'accession',
+    'filing-href': 'url'
+}
+
+# Feed patterns, compiled once at import (the regex ones serve the malformed-feed fallback)
+_ACCESSION_RE = re.compile(r'[\d-]+')
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_ALT_ACCESSION_RE = re.compile(r'accession[_-]?number[=:]([0-9-]+)', re.IGNORECASE)
+_ENTRY_RE = re.compile(r'<entry>(.*?)</entry>', re.DOTALL)
+_ATOM_FIELD_RES = {tag: re.compile(rf'<{tag}>(.*?)</{tag}>', re.DOTALL) for tag in _ATOM_FIELDS}
+
+
+def _local_name(tag: str) -> str:
+    """Element tag without its {namespace} prefix"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _cutoff_date(years: int) -> str:
+    """Oldest filing date to keep, as a YYYY-MM-DD string (compares correctly against EDGAR dates)"""
+    return (datetime.now() - timedelta(days=365 * years)).strftime('%Y-%m-%d')
+
+
+class SECRateLimiter:
+    """
+    Sliding-window limit on request starts, shared by every fetcher in the process
+    
+    Slots are reserved under a threading lock and the wait happens outside it, so
+    fetchers running on different event loops (the app's loop, asyncio.run in
+    fetch_filings) all draw from the same budget
+    """
+    
+    def __init__(self, max_requests: int, per_seconds: float = 1.0):
+        self.per_seconds = per_seconds
+        self._starts = deque(maxlen=max_requests)
+        self._lock = threading.Lock()
+    
+    async def acquire(self):
+        """Sleep until a request may start without exceeding max_requests per window"""
+        with self._lock:
+            now = time.monotonic()
+            start = now
+            if len(self._starts) == self._starts.maxlen:
+                start = max(now, self._starts[0] + self.per_seconds)
+            self._starts.append(start)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+_sec_rate_limiter = SECRateLimiter(SEC_REQUESTS_PER_SECOND)
+
+
+# SEC throttling (429) and transient server/connection failures are retried with backoff
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _is_retryable(error: BaseException) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in _RETRY_STATUSES
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
 class SECFetcher:
     """Fetches real SEC filings from EDGAR database"""
     
     BASE_URL = "https://www.sec.gov"
+    DATA_URL = "https://data.sec.gov"
     
     def __init__(self, ticker: str):
         self.ticker = ticker.upper()
         # SEC REQUIRES User-Agent header with contact info
+        # (no fixed Host: requests go to both www.sec.gov and data.sec.gov)
         self.headers = {
             'User-Agent': 'ActivistIntel demo@activist.com',
-            'Accept-Encoding': 'gzip, deflate',
-            'Host': 'www.sec.gov'
+            'Accept-Encoding': 'gzip, deflate'
         }
         self.cik = None
         self.company_name = None
     
-    def _get_cik(self) -> str:
+    async def _aget_cik(self, session: aiohttp.ClientSession) -> str:
         """Convert ticker to CIK (Central Index Key) using SEC API"""
         
-        print(f"  🔍 Looking up CIK for {self.ticker}...")
-        
-        # Use SEC company tickers JSON (updated daily)
-        tickers_url = f"{self.BASE_URL}/files/company_tickers.json"
+        logger.info("  🔍 Looking up CIK for %s...", self.ticker)
         
         try:
-            response = requests.get(tickers_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Find ticker in data
-            for entry in data.values():
-                if entry['ticker'].upper() == self.ticker:
-                    self.cik = str(entry['cik_str']).zfill(10)
-                    self.company_name = entry['title']
-                    print(f"    ✅ Found: {self.company_name} (CIK: {self.cik})")
-                    return self.cik
-            
-            raise ValueError(f"Ticker {self.ticker} not found in SEC database")
+            if not _TICKER_INDEX:
+                data = orjson.loads(await self._aload_company_tickers(session))
+                _TICKER_INDEX.update(
+                    (entry['ticker'].upper(), (str(entry['cik_str']).zfill(10), entry['title']))
+                    for entry in data.values()
+                )
             
         except Exception as e:
-            print(f"    ❌ Error fetching CIK: {str(e)}")
+            logger.error("    ❌ Error fetching CIK: %s", e)
             raise
+        
+        match = _TICKER_INDEX.get(self.ticker)
+        if match is None:
+            raise ValueError(f"Ticker {self.ticker} not found in SEC database")
+        
+        self.cik, self.company_name = match
+        logger.info("    ✅ Found: %s (CIK: %s)", self.company_name, self.cik)
+        return self.cik
+    
+    async def _aload_company_tickers(self, session: aiohttp.ClientSession) -> bytes:
+        """company_tickers.json from the disk cache, revalidating it with SEC once it is a day old"""
+        
+        cached = self._read_cached_tickers()
+        if cached is not None and time.time() - os.path.getmtime(TICKERS_CACHE_PATH) < TICKERS_MAX_AGE:
+            return cached
+        
+        headers = {}
+        if cached is not None:
+            meta = self._read_tickers_meta()
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        
+        try:
+            await _sec_rate_limiter.acquire()
+            async with session.get(f"{self.BASE_URL}/files/company_tickers.json", headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 304 and cached is not None:
+                    os.utime(TICKERS_CACHE_PATH)
+                    return cached
+                response.raise_for_status()
+                body = await response.read()
+                meta = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+        except Exception:
+            # A stale copy beats failing the lookup outright
+            if cached is not None:
+                return cached
+            raise
+        
+        os.makedirs(os.path.dirname(TICKERS_CACHE_PATH), exist_ok=True)
+        with open(TICKERS_CACHE_PATH, 'wb') as f:
+            f.write(body)
+        with open(TICKERS_META_PATH, 'wb') as f:
+            f.write(orjson.dumps(meta))
+        return body
+    
+    @staticmethod
+    def _read_cached_tickers() -> Optional[bytes]:
+        try:
+            with open(TICKERS_CACHE_PATH, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _read_tickers_meta() -> Dict:
+        try:
+            with open(TICKERS_META_PATH, 'rb') as f:
+                return orjson.loads(f.read())
+        except (OSError, ValueError):
+            return {}
     
     def fetch_filings(self, filing_types: List[str], years: int = 3) -> Dict:
         """
         Fetch real SEC filings from EDGAR
+        
+        Sync entry point for scripts; runs afetch_filings on a fresh event loop
+        (async callers such as the orchestrator should await afetch_filings)
+        """
+        return asyncio.run(self.afetch_filings(filing_types, years))
+    
+    async def afetch_filings(self, filing_types: List[str], years: int = 3) -> Dict:
+        """
+        Fetch real SEC filings from EDGAR: every form type and download runs concurrently
+        over one keep-alive aiohttp session, at most SEC_MAX_CONCURRENCY requests in flight
         """
         
-        if not self.cik:
-            self._get_cik()
+        connector = aiohttp.TCPConnector(limit_per_host=SEC_MAX_CONCURRENCY)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            if not self.cik:
+                await self._aget_cik(session)
+            
+            logger.info("\n📄 Fetching SEC filings for %s (%s)", self.company_name, self.ticker)
+            logger.info("   Looking for: %s", ', '.join(filing_types))
+            
+            sem = asyncio.Semaphore(SEC_MAX_CONCURRENCY)
+            submissions = await self._aload_submissions(session, sem)
+            results = await asyncio.gather(*(
+                self._afetch_filing_type(session, sem, filing_type, years, submissions)
+                for filing_type in filing_types
+            ))
         
-        print(f"\n📄 Fetching SEC filings for {self.company_name} ({self.ticker})")
-        print(f"   Looking for: {', '.join(filing_types)}")
+        return dict(zip(filing_types, results))
+    
+    async def _aload_submissions(self, session: aiohttp.ClientSession, sem: asyncio.Semaphore) -> Optional[Dict]:
+        """The company's recent filings index from data.sec.gov (None if unavailable)"""
+        try:
+            body = await self._aget_bytes(session, sem, f"{self.DATA_URL}/submissions/CIK{self.cik}.json", timeout=30)
+            return orjson.loads(body)['filings']['recent']
+        except Exception as e:
+            logger.warning("    ⚠️  Submissions index unavailable, using the ATOM feed: %s", e)
+            return None
+    
+    def _submission_filings(self, recent: Dict, filing_type: str, years: int) -> List[Dict]:
+        """Filings of one form type from the submissions index, linked straight to their primary document"""
         
-        results = {}
+        cutoff = _cutoff_date(years)
+        cik_no_pad = str(int(self.cik))
+        filings = []
         
-        for filing_type in filing_types:
-            print(f"\n  → Searching for {filing_type} filings...")
-            results[filing_type] = self._fetch_filing_type(filing_type, years)
-            time.sleep(0.2)
+        # The index is column-oriented: parallel arrays, one slot per filing
+        for form, date, accession, document in zip(recent['form'], recent['filingDate'],
+                                                   recent['accessionNumber'], recent['primaryDocument']):
+            if form != filing_type or date < cutoff or not document:
+                continue
+            filings.append({
+                'date': date,
+                'accession': accession,
+                'url': f"{self.BASE_URL}/Archives/edgar/data/{cik_no_pad}/{accession.replace('-', '')}/{document}"
+            })
+        
+        # Sort by date (most recent first)
+        filings.sort(key=lambda x: x['date'], reverse=True)
         
-        return results
+        return filings
+    
+    def _browse_params(self, filing_type: str, years: int) -> Dict:
+        """EDGAR browse query for this company's filings of one type, as an ATOM feed"""
+        return {
+            'action': 'getcompany',
+            'CIK': self.cik,
+            'type': filing_type,
+            # Server-side date floor so older filings never reach the parser (still re-checked client-side)
+            'datea': _cutoff_date(years).replace('-', ''),
+            'dateb': '',
+            'owner': 'exclude',
+            'start': 0,
+            'count': 100,
+            'output': 'atom'
+        }
     
-    def _fetch_filing_type(self, filing_type: str, years: int) -> List[Dict]:
-        """Fetch filings using SEC's newer JSON API"""
+    async def _afetch_filing_type(self, session: aiohttp.ClientSession, sem: asyncio.Semaphore,
+                                  filing_type: str, years: int, submissions: Optional[Dict] = None) -> List[Dict]:
+        """
+        Find one form type's filings and download them concurrently
+        
+        Uses the submissions index when it loaded (direct primary-document URLs),
+        otherwise the EDGAR ATOM feed
+        """
+        
+        logger.info("\n  → Searching for %s filings...", filing_type)
         
         try:
-            # Use SEC's submissions endpoint (returns JSON)
-            submissions_url = f"{self.BASE_URL}/cgi-bin/browse-edgar"
-            
-            params = {
-                'action': 'getcompany',
-                'CIK': self.cik,
-                'type': filing_type,
-                'dateb': '',
-                'owner': 'exclude',
-                'start': 0,
-                'count': 100,
-                'output': 'atom'
-            }
-            
-            response = requests.get(
-                submissions_url,
-                params=params,
-                headers=self.headers,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            # Parse the ATOM XML feed
-            filings = self._parse_atom_feed(response.text, years)
+            if submissions is not None:
+                filings = self._submission_filings(submissions, filing_type, years)
+            else:
+                params = self._browse_params(filing_type, years)
+                
+                xml_content = await self._aget_bytes(session, sem, f"{self.BASE_URL}/cgi-bin/browse-edgar",
+                                                     params=params, timeout=30)
+                
+                filings = self._parse_atom_feed(xml_content, years)
             
             if not filings:
-                print(f"    ⚠️  No {filing_type} filings found in last {years} years")
+                logger.warning("    ⚠️  No %s filings found in last %s years", filing_type, years)
                 return []
             
-            print(f"    ✅ Found {len(filings)} {filing_type} filing(s)")
+            logger.info("    ✅ Found %d %s filing(s)", len(filings), filing_type)
             
             # Download first 3 filings
-            downloaded = []
-            for filing in filings[:3]:
-                result = self._download_filing(filing, filing_type)
-                if result:
-                    downloaded.append(result)
-                    time.sleep(0.2)
-            
-            return downloaded
+            downloaded = await asyncio.gather(*(
+                self._adownload_filing(session, sem, filing, filing_type) for filing in filings[:3]
+            ))
+            return [result for result in downloaded if result]
             
         except Exception as e:
-            print(f"    ❌ Error: {str(e)}")
+            logger.error("    ❌ Error: %s", e)
             return []
     
-    def _parse_atom_feed(self, xml_content: str, years: int) -> List[Dict]:
-        """Parse SEC ATOM feed using regex (reliable method)"""
+    def _parse_atom_feed(self, xml_content: bytes, years: int) -> List[Dict]:
+        """Stream-parse the SEC ATOM feed (regex scan if the XML is malformed)"""
         
         filings = []
-        cutoff_date = datetime.now() - timedelta(days=365 * years)
+        cutoff = _cutoff_date(years)
         
-        # Extract all <entry> blocks
-        entries = re.findall(r'<entry>(.*?)</entry>', xml_content, re.DOTALL)
+        try:
+            entries = list(self._iter_atom_entries(xml_content))
+        except ET.ParseError:
+            entries = list(self._regex_atom_entries(xml_content.decode('utf-8', errors='replace')))
         
         for entry in entries:
-            try:
-                # Extract filing date
-                date_match = re.search(r'<filing-date>([\d-]+)</filing-date>', entry)
-                if not date_match:
-                    continue
-                
-                filing_date_str = date_match.group(1)
-                filing_date = datetime.strptime(filing_date_str, '%Y-%m-%d')
-                
-                # Check if within date range
-                if filing_date < cutoff_date:
-                    continue
-                
-                # Extract accession number
-                acc_match = re.search(r'<accession-nunber>([\d-]+)</accession-nunber>', entry)
-                if not acc_match:
-                    # Try alternate format
-                    acc_match = re.search(r'accession[_-]?number[=:]([0-9-]+)', entry, re.IGNORECASE)
-                
-                if not acc_match:
-                    continue
-                
-                accession = acc_match.group(1)
-                
-                # Extract filing URL if available
-                url_match = re.search(r'<filing-href>(.*?)</filing-href>', entry)
-                filing_url = url_match.group(1) if url_match else None
-                
-                filings.append({
-                    'date': filing_date_str,
-                    'accession': accession,
-                    'url': filing_url
-                })
-                
-            except Exception as e:
+            # ISO dates order as strings: validate the shape once, then compare directly
+            filing_date_str = entry.get('date')
+            if not filing_date_str or not _DATE_RE.fullmatch(filing_date_str) or filing_date_str < cutoff:
+                continue
+            
+            accession = entry.get('accession')
+            if not accession or not _ACCESSION_RE.fullmatch(accession):
                 continue
+            
+            filings.append({
+                'date': filing_date_str,
+                'accession': accession,
+                'url': entry.get('url')
+            })
         
         # Sort by date (most recent first)
         filings.sort(key=lambda x: x['date'], reverse=True)
         
         return filings
     
-    def _download_filing(self, filing: Dict, filing_type: str) -> Dict:
-        """Download the actual filing document"""
+    @staticmethod
+    def _iter_atom_entries(xml_content: bytes):
+        """Yield {date, accession, url} per <entry>, clearing each parsed entry to keep memory flat"""
+        root = None
+        for event, elem in ET.iterparse(BytesIO(xml_content), events=('start', 'end')):
+            if root is None:
+                root = elem
+            elif event == 'end' and _local_name(elem.tag) == 'entry':
+                fields = {}
+                for child in elem.iter():
+                    key = _ATOM_FIELDS.get(_local_name(child.tag))
+                    if key and child.text:
+                        fields.setdefault(key, child.text.strip())
+                if 'accession' not in fields:
+                    # Try alternate format
+                    acc_match = _ALT_ACCESSION_RE.search(fields.get('url', ''))
+                    if acc_match:
+                        fields['accession'] = acc_match.group(1)
+                yield fields
+                root.clear()
+    
+    @staticmethod
+    def _regex_atom_entries(xml_content: str):
+        """Regex fallback for feeds the XML parser rejects; same output as _iter_atom_entries"""
+        for entry in _ENTRY_RE.findall(xml_content):
+            fields = {}
+            for tag, key in _ATOM_FIELDS.items():
+                match = _ATOM_FIELD_RES[tag].search(entry)
+                if match:
+                    fields.setdefault(key, match.group(1).strip())
+            if 'accession' not in fields:
+                # Try alternate format
+                acc_match = _ALT_ACCESSION_RE.search(entry)
+                if acc_match:
+                    fields['accession'] = acc_match.group(1)
+            yield fields
+    
+    def _candidate_urls(self, filing: Dict) -> List[Tuple[str, str]]:
+        """(URL, save label) pairs to try in order for one filing"""
         
+        # Format: /Archives/edgar/data/CIK/ACCESSION-NO-DASH/ACCESSION-NO-DASH-index.html
         accession = filing['accession']
-        date = filing['date']
-        
-        # Try the filing URL from the feed first
-        if filing.get('url'):
-            doc_url = filing['url']
-        else:
-            # Construct URL manually
-            # Format: /Archives/edgar/data/CIK/ACCESSION-NO-DASH/ACCESSION-NO-DASH-index.html
-            cik_no_pad = str(int(self.cik))  # Remove leading zeros
-            accession_no_dash = accession.replace('-', '')
-            doc_url = f"{self.BASE_URL}/Archives/edgar/data/{cik_no_pad}/{accession_no_dash}/{accession}-index.html"
+        cik_no_pad = str(int(self.cik))  # Remove leading zeros
+        index_url = f"{self.BASE_URL}/Archives/edgar/data/{cik_no_pad}/{accession.replace('-', '')}/{accession}-index.html"
+        viewer_url = f"{self.BASE_URL}/cgi-bin/viewer?action=view&cik={self.cik}&accession_number={accession}&xbrl_type=v"
+        
+        # The document URL from the index or feed first, then the EDGAR index page, then the viewer
+        candidates = [(filing['url'], "Saved")] if filing.get('url') else []
+        if index_url != filing.get('url'):
+            candidates.append((index_url, "Saved" if not candidates else "Saved (index URL)"))
+        candidates.append((viewer_url, "Saved (alternate URL)"))
+        return candidates
+    
+    def _filing_path(self, filing_type: str, date: str, accession: str) -> str:
+        """Local cache path for a filing (creates the ticker's cache directory)"""
         
         # Create cache directory
         cache_dir = f"data/cache/{self.ticker}"
         os.makedirs(cache_dir, exist_ok=True)
         
-        # Generate safe filename
+        # Generate safe filename; the accession keeps same-day filings of one form (common for 8-Ks) apart
         safe_type = filing_type.replace(' ', '_').replace('/', '-')
-        filename = f"{self.ticker}_{safe_type}_{date}.html"
-        filepath = os.path.join(cache_dir, filename)
+        return os.path.join(cache_dir, f"{self.ticker}_{safe_type}_{date}_{accession}.html")
+    
+    def _filing_record(self, filing: Dict, doc_url: str, filepath: str, file_size: int, label: str = "Saved") -> Dict:
+        """Metadata for a filing saved to the cache"""
         
-        print(f"      📥 Downloading {date} {filing_type}...")
+        logger.info("      ✅ %s: %s (%.1f KB)", label, os.path.basename(filepath), file_size / 1024)
         
-        try:
-            response = requests.get(doc_url, headers=self.headers, timeout=60)
-            response.raise_for_status()
-            
-            # Save to file
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
-            file_size = len(response.content)
-            print(f"      ✅ Saved: {filename} ({file_size/1024:.1f} KB)")
-            
-            return {
-                'date': date,
-                'url': doc_url,
-                'path': filepath,
-                'size': file_size,
-                'accession': accession
-            }
-            
-        except Exception as e:
-            print(f"      ❌ Download failed: {str(e)}")
-            # Try alternate URL format
-            return self._try_alternate_url(filing, filing_type, filepath)
+        return {
+            'date': filing['date'],
+            'url': doc_url,
+            'path': filepath,
+            'size': file_size,
+            'accession': filing['accession']
+        }
     
-    def _try_alternate_url(self, filing: Dict, filing_type: str, filepath: str) -> Dict:
-        """Try alternate URL format if first attempt fails"""
+    async def _adownload_filing(self, session: aiohttp.ClientSession, sem: asyncio.Semaphore,
+                                filing: Dict, filing_type: str) -> Optional[Dict]:
+        """Download the actual filing document, trying each candidate URL until one succeeds"""
         
+        filepath = self._filing_path(filing_type, filing['date'], filing['accession'])
+        candidates = self._candidate_urls(filing)
+        
+        # Downloads land via rename, so any non-empty cached file is a complete filing
         try:
-            # Try the document viewer URL
-            doc_url = f"{self.BASE_URL}/cgi-bin/viewer?action=view&cik={self.cik}&accession_number={filing['accession']}&xbrl_type=v"
-            
-            response = requests.get(doc_url, headers=self.headers, timeout=60)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
-            file_size = len(response.content)
-            print(f"      ✅ Saved (alternate URL): {filepath.split('/')[-1]} ({file_size/1024:.1f} KB)")
-            
-            return {
-                'date': filing['date'],
-                'url': doc_url,
-                'path': filepath,
-                'size': file_size,
-                'accession': filing['accession']
-            }
-        except:
-            return None
+            file_size = os.stat(filepath).st_size
+        except OSError:
+            file_size = 0
+        if file_size > 0:
+            return self._filing_record(filing, candidates[0][0], filepath, file_size, "Cached")
+        
+        logger.info("      📥 Downloading %s %s...", filing['date'], filing_type)
+        
+        for doc_url, label in candidates:
+            try:
+                file_size = await self._adownload_to(session, sem, doc_url, filepath)
+                return self._filing_record(filing, doc_url, filepath, file_size, label)
+            except Exception as e:
+                logger.warning("      ❌ Download failed: %s", e)
+        
+        return None
+    
+    @retry(
+        retry=retry_if_exception(_is_retryable),
+        wait=wait_exponential(multiplier=0.5, max=8),
+        stop=stop_after_attempt(3),
+        reraise=True
+    )
+    async def _adownload_to(self, session: aiohttp.ClientSession, sem: asyncio.Semaphore, url: str,
+                            filepath: str) -> int:
+        """
+        Stream a document to filepath in DOWNLOAD_CHUNK_BYTES pieces and return its size
+        
+        Written to a .part file and renamed when complete, so a failed download never
+        leaves a truncated filing in the cache
+        """
+        part_path = filepath + '.part'
+        file_size = 0
+        async with sem:
+            await _sec_rate_limiter.acquire()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as response:
+                response.raise_for_status()
+                try:
+                    with open(part_path, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_BYTES):
+                            f.write(chunk)
+                            file_size += len(chunk)
+                except BaseException:
+                    # Never let cleanup mask the original error
+                    try:
+                        os.remove(part_path)
+                    except OSError:
+                        pass
+                    raise
+        os.replace(part_path, filepath)
+        return file_size
+    
+    @retry(
+        retry=retry_if_exception(_is_retryable),
+        wait=wait_exponential(multiplier=0.5, max=8),
+        stop=stop_after_attempt(3),
+        reraise=True
+    )
+    async def _aget_bytes(self, session: aiohttp.ClientSession, sem: asyncio.Semaphore, url: str,
+                          params: Dict = None, timeout: float = 60) -> bytes:
+        """GET a response body under the shared concurrency cap (the slot is released between retries)"""
+        async with sem:
+            await _sec_rate_limiter.acquire()
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                response.raise_for_status()
+                return await response.read()
     
     def get_latest_filing(self, filing_type: str) -> str:
         """Get path to most recent filing"""
@@ -256,6 +506,8 @@ class SECFetcher:
 
 # Test
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     print("🧪 Testing SEC Fetcher\n")
     
     fetcher = SECFetcher('AAPL')